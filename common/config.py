@@ -17,6 +17,8 @@ LOG_FORMAT = os.getenv(
     "%(asctime)s - %(filename)s:%(lineno)d - %(levelname)s - %(message)s",
 )
 PROXY_URL = os.getenv("PROXY_URL", "").strip()
+# Prometheus metrics port (optional, 0 = disabled, requires prometheus_client)
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0") or 0)
 
 # StandX API token mode
 STANDX_API_TOKEN = os.getenv("STANDX_API_TOKEN", "").strip()
@@ -0,0 +1,58 @@
+"""
+Prometheus 指标模块（可选）
+
+未安装 prometheus_client 或未配置 METRICS_PORT 时，所有接口均为空操作。
+"""
+
+import logging
+from typing import Optional
+
+try:
+    from prometheus_client import Gauge, start_http_server
+except ImportError:  # 可选依赖
+    Gauge = None
+    start_http_server = None
+
+logger = logging.getLogger(__name__)
+
+_pnl_gauge = None
+_price_gauge = None
+_runtime_gauge = None
+
+
+def start_metrics_server(port: int) -> bool:
+    """
+    启动指标 HTTP 服务并注册指标
+
+    Args:
+        port: 监听端口，<= 0 表示不启用
+
+    Returns:
+        是否已启用
+    """
+    global _pnl_gauge, _price_gauge, _runtime_gauge
+
+    if port <= 0:
+        return False
+    if Gauge is None:
+        logger.warning("未安装 prometheus_client，指标导出已关闭")
+        return False
+    if _pnl_gauge is not None:
+        return True
+
+    _pnl_gauge = Gauge("perp_pnl", "未实现盈亏 (相对初始保证金)")
+    _price_gauge = Gauge("perp_current_price", "最新标记价格")
+    _runtime_gauge = Gauge("perp_runtime_seconds", "策略运行时长 (秒)")
+    start_http_server(port)
+    logger.info(f"Prometheus 指标已启用, 端口: {port}")
+    return True
+
+
+def record_runtime(pnl: float, price: Optional[float], runtime: float) -> None:
+    """更新运行指标，未启用时直接返回"""
+    if _pnl_gauge is None:
+        return
+    _pnl_gauge.set(pnl)
+    if price is not None:
+        _price_gauge.set(price)
+    _runtime_gauge.set(runtime)
@@ -3,6 +3,7 @@ import base64
 import json
 import logging
 import os
+import random
 import time
 import uuid
 from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
@@ -15,6 +16,7 @@ from cryptography.hazmat.primitives.asymmetric import ed25519
 
 from .interfaces import ExchangeInterface
 from .order_converter import normalize_orders_list
+from .rate_limiter import AsyncTokenBucket
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +27,10 @@ class StandXAdapter(ExchangeInterface):
     MARKET_ID_TO_SYMBOL = {
         0: "ETH-USD",
     }
+    WS_RECONNECT_BASE_SEC = 1.0
+    WS_RECONNECT_MAX_SEC = 30.0
+    # Stream frames are small price/order/position updates; cap well below aiohttp's 4 MiB default.
+    WS_MAX_MSG_SIZE = 1 << 20
 
     def __init__(self, market_id: int = 0, symbol: Optional[str] = None):
         if market_id != 0:
@@ -42,6 +48,9 @@ class StandXAdapter(ExchangeInterface):
         self.price_tick = self._safe_float_env("STANDX_PRICE_TICK", 0.1)
         self.qty_step = self._safe_float_env("STANDX_QTY_STEP", 0.001)
         self.http_timeout_sec = self._safe_float_env("STANDX_HTTP_TIMEOUT_SEC", 8.0)
+        # Signed (trade) requests share one budget so cancel/place bursts queue locally
+        # instead of being rejected by the venue.
+        self.order_rate_limiter = self._load_order_rate_limiter()
         self._ed25519_private_key = self._load_request_sign_private_key(
             os.getenv("STANDX_REQUEST_SIGN_PRIVATE_KEY", "").strip()
         )
@@ -55,6 +64,21 @@ class StandXAdapter(ExchangeInterface):
         self.ws_ready = asyncio.Event()
         self.ws_authed = False
 
+    @classmethod
+    def _load_order_rate_limiter(cls) -> Optional[AsyncTokenBucket]:
+        """STANDX_ORDER_RATE_PER_SEC <= 0 disables the limiter; unparsable values fall back to 10/s."""
+        raw = os.getenv("STANDX_ORDER_RATE_PER_SEC", "").strip()
+        rate = 10.0
+        if raw:
+            try:
+                rate = float(raw)
+            except ValueError:
+                logger.warning("Invalid STANDX_ORDER_RATE_PER_SEC=%r, using %.1f", raw, rate)
+        if rate <= 0:
+            logger.info("Order rate limiter disabled (STANDX_ORDER_RATE_PER_SEC=%s)", raw)
+            return None
+        return AsyncTokenBucket(rate=rate, capacity=cls._safe_float_env("STANDX_ORDER_BURST", 10.0))
+
     @staticmethod
     def _safe_float_env(name: str, default: float) -> float:
         raw = os.getenv(name, "").strip()
@@ -233,8 +257,11 @@ class StandXAdapter(ExchangeInterface):
         return json.dumps(payload)
 
     async def _ensure_session(self) -> None:
+        # One pooled session shared by REST and the market websocket, so TLS/keep-alive
+        # connections are reused and shutdown only has a single session to close.
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession(headers={"Content-Type": "application/json", "Accept": "application/json"})
+            connector = aiohttp.TCPConnector(limit=20, keepalive_timeout=30)
+            self.session = aiohttp.ClientSession(connector=connector)
 
     def _build_auth_headers(self) -> Dict[str, str]:
         if not self.auth_token:
@@ -271,9 +298,12 @@ class StandXAdapter(ExchangeInterface):
         signed: bool = False,
         extra_headers: Optional[Dict[str, str]] = None,
     ) -> Any:
+        if signed and self.order_rate_limiter is not None:
+            await self.order_rate_limiter.acquire()
         await self._ensure_session()
 
-        headers = self._build_auth_headers()
+        headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        headers.update(self._build_auth_headers())
         if extra_headers:
             headers.update(extra_headers)
         if payload is not None and signed:
@@ -623,41 +653,71 @@ class StandXAdapter(ExchangeInterface):
             return
 
         self.ws_task = asyncio.create_task(self._market_ws_loop())
-        await asyncio.wait_for(self.ws_ready.wait(), timeout=15)
+        try:
+            await asyncio.wait_for(self.ws_ready.wait(), timeout=15)
+        except asyncio.TimeoutError:
+            # Don't leave a reconnect loop running behind a failed subscribe.
+            ws_task, self.ws_task = self.ws_task, None
+            ws_task.cancel()
+            try:
+                await ws_task
+            except asyncio.CancelledError:
+                pass
+            raise
+
+    @classmethod
+    def _reconnect_delay(cls, attempt: int) -> float:
+        """Exponential backoff with +/-50% jitter so multiple clients do not reconnect in lockstep."""
+        base = min(cls.WS_RECONNECT_MAX_SEC, cls.WS_RECONNECT_BASE_SEC * (2 ** min(attempt, 16)))
+        return base * (0.5 + random.random())
 
     async def _market_ws_loop(self) -> None:
+        attempt = 0
         while True:
             try:
-                async with aiohttp.ClientSession() as ws_session:
-                    async with ws_session.ws_connect(self.ws_stream_url, heartbeat=30, proxy=self.proxy) as ws:
-                        self.ws_market_client = ws
-                        self.ws_ready.set()
-                        self.ws_authed = False
-
-                        auth_msg = {"auth": {"token": self.auth_token}}
-                        await ws.send_json(auth_msg)
-
-                        # Subscribe channels used by strategy.
-                        await ws.send_json({"subscribe": {"channel": "price", "symbol": self.symbol}})
-                        await ws.send_json({"subscribe": {"channel": "order"}})
-                        await ws.send_json({"subscribe": {"channel": "position"}})
-
-                        async for msg in ws:
-                            if msg.type == aiohttp.WSMsgType.TEXT:
-                                try:
-                                    payload = json.loads(msg.data)
-                                except Exception:
-                                    continue
-                                await self._handle_ws_message(payload)
-                            elif msg.type == aiohttp.WSMsgType.PING:
-                                await ws.pong()
-                            elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
-                                break
+                await self._ensure_session()
+                async with self.session.ws_connect(
+                    self.ws_stream_url,
+                    heartbeat=30,
+                    proxy=self.proxy,
+                    max_msg_size=self.WS_MAX_MSG_SIZE,
+                ) as ws:
+                    self.ws_market_client = ws
+                    self.ws_ready.set()
+                    self.ws_authed = False
+                    attempt = 0
+
+                    auth_msg = {"auth": {"token": self.auth_token}}
+                    await ws.send_json(auth_msg)
+
+                    # Subscribe channels used by strategy.
+                    await ws.send_json({"subscribe": {"channel": "price", "symbol": self.symbol}})
+                    await ws.send_json({"subscribe": {"channel": "order"}})
+                    await ws.send_json({"subscribe": {"channel": "position"}})
+
+                    # Bind the per-message callables once for the receive loop.
+                    loads = json.loads
+                    handle_message = self._handle_ws_message
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT:
+                            try:
+                                payload = loads(msg.data)
+                            except Exception:
+                                continue
+                            await handle_message(payload)
+                        elif msg.type == aiohttp.WSMsgType.PING:
+                            await ws.pong()
+                        elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                            break
+                logger.warning("StandX stream websocket closed by server")
             except Exception as e:
                 logger.warning("StandX stream websocket disconnected: %s", e)
-                self.ws_ready.clear()
-                self.ws_authed = False
-                await asyncio.sleep(2)
+            self.ws_ready.clear()
+            self.ws_authed = False
+            delay = self._reconnect_delay(attempt)
+            attempt += 1
+            logger.info("Reconnecting StandX stream websocket in %.1fs (attempt %s)", delay, attempt)
+            await asyncio.sleep(delay)
 
     async def _emit(self, key: str, *args) -> None:
         cb = self.callbacks.get(key)
@@ -704,14 +764,17 @@ class StandXAdapter(ExchangeInterface):
     async def close(self):
         if self.ws_task and not self.ws_task.done():
             self.ws_task.cancel()
-            try:
-                await self.ws_task
-            except asyncio.CancelledError:
-                pass
+            # Bounded wait: a task stuck on a dead transport must not stall shutdown.
+            _, pending = await asyncio.wait({self.ws_task}, timeout=1.0)
+            if pending:
+                logger.warning("StandX stream websocket task did not stop within 1s")
         self.ws_task = None
 
         if self.ws_market_client and not self.ws_market_client.closed:
-            await self.ws_market_client.close()
+            try:
+                await asyncio.wait_for(self.ws_market_client.close(), timeout=1.0)
+            except (asyncio.TimeoutError, aiohttp.ClientError, OSError) as e:
+                logger.warning("StandX stream websocket close failed: %s", e)
         self.ws_market_client = None
         self.ws_ready.clear()
 
@@ -732,6 +795,7 @@ class StandXAdapter(ExchangeInterface):
         return self.auth_token, None
 
     async def get_account_info(self) -> dict:
-        account = await self.get_account()
-        account["positions"] = await self.get_positions()
+        # Balance and positions are independent; fetch them concurrently.
+        account, positions = await asyncio.gather(self.get_account(), self.get_positions())
+        account["positions"] = positions
         return account
@@ -1,5 +1,6 @@
 import asyncio
 import os
+import signal
 from typing import Any, Dict
 
 from dotenv import load_dotenv
@@ -29,4 +30,30 @@ if __name__ == "__main__":
     if exchange_type != "standx":
         raise ValueError("This project only supports EXCHANGE_TYPE=standx")
 
-    asyncio.run(quant_grid_universal.run_grid_trading("standx", load_grid_config()))
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    main_task = loop.create_task(
+        quant_grid_universal.run_grid_trading("standx", load_grid_config())
+    )
+    # 信号直接投递到事件循环，以取消主任务的方式停止，保证 finally 中的清理逻辑执行
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, main_task.cancel)
+        except NotImplementedError:
+            # Windows 不支持 add_signal_handler，退回 KeyboardInterrupt
+            pass
+
+    try:
+        loop.run_until_complete(main_task)
+    except asyncio.CancelledError:
+        pass
+    except KeyboardInterrupt:
+        # 未注册信号处理器时（Windows），取消主任务并等待其 finally 清理完成
+        main_task.cancel()
+        try:
+            loop.run_until_complete(main_task)
+        except asyncio.CancelledError:
+            pass
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
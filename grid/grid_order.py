@@ -4,22 +4,28 @@
 包含订单检查、取消、同步和成交处理。
 """
 
+import asyncio
 import logging
 import time
 from datetime import datetime
+from itertools import islice
+from operator import itemgetter
 from typing import List
 
 from . import grid_state
 from exchanges.order_converter import normalize_order_to_ccxt
 
 logger = logging.getLogger(__name__)
-_POSITION_EPS = 1e-9
+
+# 单次批量撤单请求的最大订单数
+CANCEL_BATCH_SIZE = 20
 
 
 def _trim_id_cache(cache: set[str], max_size: int = 5000) -> None:
     if len(cache) <= max_size:
         return
-    for key in list(cache)[: len(cache) - max_size]:
+    # 只取出需要淘汰的部分，不复制整个集合
+    for key in tuple(islice(cache, len(cache) - max_size)):
         cache.discard(key)
 
 
@@ -56,18 +62,14 @@ def _pop_order_from_books(
         return False
 
     # Fallback by nearest price for mismatched WS identifiers.
-    if not book:
+    nearest = book.nearest(float(price))
+    if nearest is None:
         return False
-    nearest_id = None
-    nearest_diff = float("inf")
-    for oid, p in book.items():
-        diff = abs(float(p) - float(price))
-        if diff < nearest_diff:
-            nearest_id = oid
-            nearest_diff = diff
+    nearest_id, nearest_price = nearest
+    nearest_diff = abs(float(nearest_price) - float(price))
     # Tolerance uses min grid step with a little slack.
     tolerance = max(trading_state.base_grid_single_price * 0.6, 0.6)
-    if nearest_id is not None and nearest_diff <= tolerance:
+    if nearest_diff <= tolerance:
         del book[nearest_id]
         logger.info(
             "通过价格匹配删除%s单: 订单ID=%s, 成交价=%s, 挂单价差=%s",
@@ -134,12 +136,6 @@ def _normalize_trade_event(trade: dict) -> dict:
     }
 
 
-def _max_close_orders_by_position(available_position_size: float, grid_amount: float) -> int:
-    if grid_amount <= 0:
-        return 0
-    return max(0, int((available_position_size + _POSITION_EPS) / grid_amount))
-
-
 async def check_order_fills(orders: dict):
     """
     检查订单成交情况
@@ -148,61 +144,72 @@ async def check_order_fills(orders: dict):
         orders: 订单列表
     """
     trading_state = grid_state.trading_state
-    GRID_CONFIG = grid_state.GRID_CONFIG
+    GRID_AMOUNT = grid_state.GRID_CONFIG["GRID_AMOUNT"]
     OPEN_SIDE_IS_ASK = grid_state.OPEN_SIDE_IS_ASK
+    replenish_queue = grid_state.replenish_queue
     replenish_grid_lock = grid_state.replenish_grid_lock
     
-    for order in orders:
-        # 从 CCXT 格式提取字段
-        order_id_candidates = _extract_order_id_candidates(order)
-        client_order_index = order_id_candidates[0] if order_id_candidates else ""
-        status = order.get("status")
-        side = order.get("side", "buy")  # 'buy' or 'sell'
-        price = order.get("price", 0)
-        filled_amount = float(order.get("filled", 0))
-        initial_base_amount = float(order.get("amount", 0))
+    pause_orders = trading_state.pause_orders
+
+    # 订单簿修改与补单协程互斥（循环内无 await，每批推送只加锁一次）
+    async with replenish_grid_lock:
+        for order in orders:
+            # 先做无需类型转换的过滤：只有挂单和成交两种状态需要处理
+            status = order.get("status")
+            is_filled = status in ("closed", "filled")
+            if status != "open" and not is_filled:
+                continue
 
-        is_ask = side == "sell"
+            # 过滤非网格订单 (占位订单等)
+            initial_base_amount = float(order.get("amount", 0))
+            if initial_base_amount > GRID_AMOUNT:
+                continue
 
-        # 判断是开仓侧还是平仓侧订单
-        if OPEN_SIDE_IS_ASK:  # 做空策略
-            is_open_side_order = is_ask
-            is_close_side_order = not is_ask
-        else:  # 做多策略
-            is_open_side_order = not is_ask
-            is_close_side_order = is_ask
+            filled_amount = float(order.get("filled", 0))
+            if is_filled and filled_amount <= 0:
+                continue
 
-        # 过滤非网格订单 (占位订单等)
-        if initial_base_amount > GRID_CONFIG["GRID_AMOUNT"]:
-            continue
-        
-        # 如果是已知的占位订单，也忽略 (防止update消息中amount为0导致的误判)
-        if any(oid in trading_state.pause_orders for oid in order_id_candidates):
-            continue
+            # 从 CCXT 格式提取字段
+            order_id_candidates = _extract_order_id_candidates(order)
 
-        # 记录是否需要补单，如果不在列表中，有可能是直接成交，则不补单
-        replenish = False
+            # 如果是已知的占位订单，也忽略 (防止update消息中amount为0导致的误判)
+            if any(oid in pause_orders for oid in order_id_candidates):
+                continue
 
-        logger.info(
-            f"检查订单: ID={client_order_index}, 方向={side}, "
-            f"价格={price}, 状态={status}, 成交量={filled_amount}"
-        )
+            client_order_index = order_id_candidates[0] if order_id_candidates else ""
+            side = order.get("side", "buy")  # 'buy' or 'sell'
+            price = order.get("price", 0)
+            is_ask = side == "sell"
+
+            # 判断是否为平仓侧订单（做空：买单；做多：卖单）
+            is_close_side_order = is_ask != OPEN_SIDE_IS_ASK
 
-        async with replenish_grid_lock:
-            if status in ["open"]:
+            # 记录是否需要补单，如果不在列表中，有可能是直接成交，则不补单
+            replenish = False
+
+            logger.debug(
+                "检查订单: ID=%s, 方向=%s, 价格=%s, 状态=%s, 成交量=%s",
+                client_order_index,
+                side,
+                price,
+                status,
+                filled_amount,
+            )
+
+            if status == "open":
                 if is_ask:
                     trading_state.sell_orders[client_order_index] = float(price)
                 else:
                     trading_state.buy_orders[client_order_index] = float(price)
 
             # 如果订单已成交
-            if status in ["closed", "filled"] and filled_amount > 0:
+            if is_filled:
                 trading_state.filled_count += 1
                 trading_state.last_trade_price = float(price)
                 for oid in order_id_candidates:
                     trading_state.recent_filled_order_ids.add(oid)
                 _trim_id_cache(trading_state.recent_filled_order_ids)
-                
+            
                 trading_state.last_filled_order_is_close_side = is_close_side_order
                 replenish = _pop_order_from_books(
                     is_ask=is_ask,
@@ -215,25 +222,20 @@ async def check_order_fills(orders: dict):
                     # 吃掉平仓单时，由于仓位更新推送较慢，先将记录仓位提前降低
                     trading_state.available_position_size = round(
                         trading_state.available_position_size
-                        - GRID_CONFIG["GRID_AMOUNT"],
+                        - GRID_AMOUNT,
                         2,
                     )
 
                     # 收到平仓单成交时，证明完成了一次网格套利，记录套利收益
                     once_profit = (
                         trading_state.base_grid_single_price
-                        * GRID_CONFIG["GRID_AMOUNT"]
+                        * GRID_AMOUNT
                     )
-                    trading_state.active_profit += once_profit
-                    trading_state.total_profit += once_profit
-                    trading_state.available_reduce_profit += once_profit
+                    trading_state.add_grid_profit(once_profit)
 
-        # 在锁范围外补充网格订单
-        if replenish:
-            from .grid_replenish import replenish_grid
-            async with replenish_grid_lock:
-                await replenish_grid(True, float(price))
-                trading_state.last_replenish_time = time.time()
+            # 交给补单协程按成交顺序逐笔补单
+            if replenish:
+                replenish_queue.put_nowait((float(price), is_close_side_order))
 
 
 async def reconcile_fills_from_recent_trades(limit: int = 50):
@@ -242,8 +244,9 @@ async def reconcile_fills_from_recent_trades(limit: int = 50):
     当 WS 漏推成交或订单ID格式不一致时，从 recent trades 识别新成交并触发补单。
     """
     trading_state = grid_state.trading_state
-    GRID_CONFIG = grid_state.GRID_CONFIG
+    GRID_AMOUNT = grid_state.GRID_CONFIG["GRID_AMOUNT"]
     OPEN_SIDE_IS_ASK = grid_state.OPEN_SIDE_IS_ASK
+    replenish_queue = grid_state.replenish_queue
     replenish_grid_lock = grid_state.replenish_grid_lock
 
     if trading_state.grid_trading is None:
@@ -254,7 +257,7 @@ async def reconcile_fills_from_recent_trades(limit: int = 50):
         return
 
     events = [_normalize_trade_event(t) for t in trades if isinstance(t, dict)]
-    events.sort(key=lambda e: e.get("ts", 0))
+    events.sort(key=itemgetter("ts"))
 
     # 首次对账只建立基线，避免把历史成交当作“新成交”触发补单风暴。
     if not trading_state.trade_reconcile_seeded:
@@ -267,41 +270,42 @@ async def reconcile_fills_from_recent_trades(limit: int = 50):
 
     strategy_start_ms = int(trading_state.start_time * 1000)
 
-    for event in events:
-        trade_key = event["trade_key"]
-        if trade_key in trading_state.processed_trade_keys:
-            continue
+    # 订单簿修改与补单协程互斥（循环内无 await）
+    async with replenish_grid_lock:
+        for event in events:
+            trade_key = event["trade_key"]
+            if trade_key in trading_state.processed_trade_keys:
+                continue
 
-        trading_state.processed_trade_keys.add(trade_key)
-        _trim_id_cache(trading_state.processed_trade_keys)
+            trading_state.processed_trade_keys.add(trade_key)
+            _trim_id_cache(trading_state.processed_trade_keys)
 
-        side = event["side"]
-        price = event["price"]
-        qty = event["qty"]
-        order_ref = event["order_ref"]
-        event_ts = int(event.get("ts", 0))
+            side = event["side"]
+            price = event["price"]
+            qty = event["qty"]
+            order_ref = event["order_ref"]
+            event_ts = int(event.get("ts", 0))
 
-        if qty <= 0 or price <= 0 or side not in ("buy", "sell"):
-            continue
+            if qty <= 0 or price <= 0 or side not in ("buy", "sell"):
+                continue
 
-        # 忽略策略启动前的历史成交，防止重启时误触发补单。
-        if event_ts and event_ts < strategy_start_ms - 3000:
-            continue
+            # 忽略策略启动前的历史成交，防止重启时误触发补单。
+            if event_ts and event_ts < strategy_start_ms - 3000:
+                continue
 
-        if qty > GRID_CONFIG["GRID_AMOUNT"] * 1.5:
-            # 过滤明显非网格成交
-            continue
+            if qty > GRID_AMOUNT * 1.5:
+                # 过滤明显非网格成交
+                continue
 
-        if order_ref and order_ref in trading_state.recent_filled_order_ids:
-            continue
+            if order_ref and order_ref in trading_state.recent_filled_order_ids:
+                continue
 
-        is_ask = side == "sell"
-        if OPEN_SIDE_IS_ASK:
-            is_close_side_order = not is_ask
-        else:
-            is_close_side_order = is_ask
+            is_ask = side == "sell"
+            if OPEN_SIDE_IS_ASK:
+                is_close_side_order = not is_ask
+            else:
+                is_close_side_order = is_ask
 
-        async with replenish_grid_lock:
             matched = _pop_order_from_books(
                 is_ask=is_ask,
                 order_ids=[order_ref] if order_ref else [],
@@ -320,20 +324,15 @@ async def reconcile_fills_from_recent_trades(limit: int = 50):
 
             if is_close_side_order:
                 trading_state.available_position_size = round(
-                    trading_state.available_position_size - GRID_CONFIG["GRID_AMOUNT"],
+                    trading_state.available_position_size - GRID_AMOUNT,
                     2,
                 )
                 once_profit = (
-                    trading_state.base_grid_single_price * GRID_CONFIG["GRID_AMOUNT"]
+                    trading_state.base_grid_single_price * GRID_AMOUNT
                 )
-                trading_state.active_profit += once_profit
-                trading_state.total_profit += once_profit
-                trading_state.available_reduce_profit += once_profit
+                trading_state.add_grid_profit(once_profit)
 
-        from .grid_replenish import replenish_grid
-        async with replenish_grid_lock:
-            await replenish_grid(True, float(price))
-            trading_state.last_replenish_time = time.time()
+            replenish_queue.put_nowait((float(price), is_close_side_order))
 
 
 async def check_current_orders():
@@ -345,134 +344,104 @@ async def check_current_orders():
     await _sync_current_orders()
     
     trading_state = grid_state.trading_state
-    GRID_CONFIG = grid_state.GRID_CONFIG
+    GRID_AMOUNT = grid_state.GRID_CONFIG["GRID_AMOUNT"]
+    GRID_COUNT = grid_state.GRID_CONFIG["GRID_COUNT"]
+    MAX_TOTAL_ORDERS = grid_state.GRID_CONFIG["MAX_TOTAL_ORDERS"]
     OPEN_SIDE_IS_ASK = grid_state.OPEN_SIDE_IS_ASK
     
+    # 各规则只收集待取消订单（有序去重），最后统一发起一次批量撤单
+    pending_cancels: dict[str, None] = {}
+
     # 如果 Open Side 订单过多，取消最远的订单
-    if trading_state.open_orders_count > GRID_CONFIG["GRID_COUNT"] + 1:
-        logger.info(f"开仓侧订单过多，删除多余订单")
-        cancel_orders = []
+    if trading_state.open_orders_count > GRID_COUNT + 1:
+        logger.info("开仓侧订单过多，删除多余订单")
+        cancel_count = trading_state.open_orders_count - (GRID_COUNT + 1)
 
         # 排序订单
         # 做多：买单，最远的是最低价，正序排列取前N个
         # 做空：卖单，最远的是最高价，逆序排列取前N个
         reverse_sort = OPEN_SIDE_IS_ASK
-        sorted_orders = sorted(
-            trading_state.open_orders.items(), 
-            key=lambda item: item[1], 
-            reverse=reverse_sort
-        )
-
-        cancel_count = trading_state.open_orders_count - (GRID_CONFIG["GRID_COUNT"] + 1)
-        orders_to_iter = dict(sorted_orders)
+        farthest_orders = trading_state.open_orders.sorted_items(reverse=reverse_sort)
+        for order_id, price in islice(farthest_orders, cancel_count):
+            pending_cancels[order_id] = None
+            logger.info("取消最远开仓单，价格=%s, 订单ID=%s", price, order_id)
 
-        for order_id, price in orders_to_iter.items():
-            if len(cancel_orders) < cancel_count:
-                cancel_orders.append(order_id)
-                logger.info(f"取消最远开仓单，价格={price}, 订单ID={order_id}")
-            else:
-                break
-
-        await _cancel_orders(cancel_orders)
+    # 平仓侧修剪：订单过多与超出持仓两条规则都取消最远的平仓单，合并为一次遍历
+    close_orders_count = trading_state.close_orders_count
 
     # 如果 Close Side 订单过多
-    if trading_state.close_orders_count > GRID_CONFIG["MAX_TOTAL_ORDERS"]:
-        cancel_orders = []
-        
-        # 做多：卖单，最远的是最高价，逆序排列
-        # 做空：买单，最远的是最低价，正序排列
-        reverse_sort = not OPEN_SIDE_IS_ASK
-        sorted_orders = sorted(
-            trading_state.close_orders.items(), 
-            key=lambda item: item[1], 
-            reverse=reverse_sort
-        )
-
-        cancel_count = trading_state.close_orders_count - GRID_CONFIG["MAX_TOTAL_ORDERS"] + 2
-
-        for order_id, price in dict(sorted_orders).items():
-            # 双重保护：如果该订单是占位订单，绝对不取消
-            if order_id in trading_state.pause_orders:
-                continue
-                
-            if len(cancel_orders) < cancel_count:
-                cancel_orders.append(order_id)
-                logger.info(f"取消最远平仓单，价格={price}, 订单ID={order_id}")
-            else:
-                break
-
-        await _cancel_orders(cancel_orders)
+    overflow_count = 0
+    if close_orders_count > MAX_TOTAL_ORDERS:
+        overflow_count = close_orders_count - MAX_TOTAL_ORDERS + 2
 
     # 平仓侧订单不能超过持仓量 (Position Sizing check)
-    max_close_orders = _max_close_orders_by_position(
-        trading_state.available_position_size,
-        GRID_CONFIG["GRID_AMOUNT"],
-    )
+    cancel_count = overflow_count
+    max_close_orders = trading_state.available_close_slots
+    close_orders_left = close_orders_count - overflow_count
     if (
-        trading_state.close_orders_count > max_close_orders
+        close_orders_left > max_close_orders
         and (time.time() - trading_state.start_time) > 60
     ):
         logger.info(
             "平仓单总量超过持仓，进行修剪: close_orders=%s, max_allowed=%s, available_position=%.6f, grid_amount=%.6f",
-            trading_state.close_orders_count,
+            close_orders_left,
             max_close_orders,
             trading_state.available_position_size,
-            GRID_CONFIG["GRID_AMOUNT"],
+            GRID_AMOUNT,
         )
-        cancel_orders = []
-        
-        # 取消最远的订单
+        cancel_count = close_orders_count - max_close_orders
+
+    if cancel_count > 0:
+        # 做多：卖单，最远的是最高价，逆序排列
+        # 做空：买单，最远的是最低价，正序排列
         reverse_sort = not OPEN_SIDE_IS_ASK
-        sorted_orders = sorted(
-            trading_state.close_orders.items(), 
-            key=lambda item: item[1], 
-            reverse=reverse_sort
+        pause_orders = trading_state.pause_orders
+        # 双重保护：占位订单绝对不取消；订单簿已有序，只惰性取前 cancel_count 个
+        farthest_orders = (
+            item
+            for item in trading_state.close_orders.sorted_items(reverse=reverse_sort)
+            if item[0] not in pause_orders
         )
-
-        cancel_count = trading_state.close_orders_count - max_close_orders
-
-        if cancel_count > 0:
-            for order_id, price in dict(sorted_orders).items():
-                if order_id in trading_state.pause_orders:
-                    continue
-                    
-                if len(cancel_orders) < cancel_count:
-                    cancel_orders.append(order_id)
-                    logger.info(f"取消最远平仓单(超出持仓)，价格={price}, 订单ID={order_id}")
-                else:
-                    break
-            await _cancel_orders(cancel_orders)
+        for cancelled, (order_id, price) in enumerate(
+            islice(farthest_orders, cancel_count), 1
+        ):
+            pending_cancels[order_id] = None
+            if cancelled <= overflow_count:
+                logger.info("取消最远平仓单，价格=%s, 订单ID=%s", price, order_id)
+            else:
+                logger.info("取消最远平仓单(超出持仓)，价格=%s, 订单ID=%s", price, order_id)
 
     # 交易暂停清理
     if trading_state.grid_pause:
-        if len(trading_state.buy_orders) > 0:
-            await _cancel_orders(list(trading_state.buy_orders.keys()))
-        if len(trading_state.sell_orders) > 0:
-            await _cancel_orders(list(trading_state.sell_orders.keys()))
+        pending_cancels.update(dict.fromkeys(trading_state.buy_orders))
+        pending_cancels.update(dict.fromkeys(trading_state.sell_orders))
 
     # 检查重复订单
-    await _check_duplicate_orders(trading_state.buy_orders)
-    await _check_duplicate_orders(trading_state.sell_orders)
+    _collect_duplicate_orders(trading_state.buy_orders, pending_cancels)
+    _collect_duplicate_orders(trading_state.sell_orders, pending_cancels)
 
+    await _cancel_orders(list(pending_cancels))
 
-async def _check_duplicate_orders(orders: dict):
+
+def _collect_duplicate_orders(orders: grid_state.OrderBook, pending_cancels: dict):
     """
-    检查并取消重复价格的订单
+    检查重复价格的订单，并加入待取消集合
     
     Args:
-        orders: 订单字典
+        orders: 订单簿
+        pending_cancels: 待取消订单（有序去重），已在其中的订单不参与比较
     """
     if len(orders) > 0:
-        cancel_orders = []
-        sorted_orders = dict(sorted(orders.copy().items(), key=lambda item: item[1]))
-        prev_price = None
-        for order_id, price in sorted_orders.items():
-            if prev_price is not None and round(price, 4) == round(prev_price, 4):
-                cancel_orders.append(order_id)
-                logger.info(f"检测到重复价格订单，删除ID={order_id}, 价格={price}")
-            prev_price = price
-        if len(cancel_orders) > 0:
-            await _cancel_orders(cancel_orders)
+        price_to_ticks = grid_state.price_to_ticks
+        prev_ticks = None
+        for order_id, price in orders.sorted_items():
+            if order_id in pending_cancels:
+                continue
+            ticks = price_to_ticks(price)
+            if ticks == prev_ticks:
+                pending_cancels[order_id] = None
+                logger.info("检测到重复价格订单，删除ID=%s, 价格=%s", order_id, price)
+            prev_ticks = ticks
 
 
 async def _cancel_orders(cancel_orders: List[int]):
@@ -486,14 +455,28 @@ async def _cancel_orders(cancel_orders: List[int]):
     
     if not cancel_orders:
         return
-    success = await trading_state.grid_trading.cancel_grid_orders(cancel_orders)
-    if success:
-        for order_id in cancel_orders:
-            if order_id in trading_state.buy_orders:
-                del trading_state.buy_orders[order_id]
-            if order_id in trading_state.sell_orders:
-                del trading_state.sell_orders[order_id]
-        logger.info(f"批量取消订单成功: {len(cancel_orders)}个")
+    # 按批拆分后并发请求批量撤单接口，单批失败不影响其他批次
+    chunks = [
+        cancel_orders[i:i + CANCEL_BATCH_SIZE]
+        for i in range(0, len(cancel_orders), CANCEL_BATCH_SIZE)
+    ]
+    cancel_grid_orders = trading_state.grid_trading.cancel_grid_orders
+    results = await asyncio.gather(
+        *(cancel_grid_orders(chunk) for chunk in chunks), return_exceptions=True
+    )
+    cancelled = 0
+    for chunk, success in zip(chunks, results):
+        if isinstance(success, BaseException):
+            logger.error("批量取消订单异常: %s", success)
+            continue
+        if not success:
+            continue
+        for order_id in chunk:
+            trading_state.buy_orders.pop(order_id, None)
+            trading_state.sell_orders.pop(order_id, None)
+        cancelled += len(chunk)
+    if cancelled:
+        logger.info("批量取消订单成功: %s个", cancelled)
 
 
 async def _sync_current_orders():
@@ -501,7 +484,7 @@ async def _sync_current_orders():
     同步订单状态（通过 REST API 核对当前订单列表）
     """
     trading_state = grid_state.trading_state
-    GRID_CONFIG = grid_state.GRID_CONFIG
+    GRID_AMOUNT = grid_state.GRID_CONFIG["GRID_AMOUNT"]
     CLOSE_SIDE_IS_ASK = grid_state.CLOSE_SIDE_IS_ASK
     
     # 通过 rest api 核对当前订单列表
@@ -509,35 +492,34 @@ async def _sync_current_orders():
     if orders is None:
         return
 
-    normalized_orders = (
-        [normalize_order_to_ccxt(order) for order in orders]
-        if isinstance(orders, list)
-        else []
-    )
+    if not isinstance(orders, list):
+        orders = []
+
+    buy_orders = grid_state.OrderBook()
+    sell_orders = grid_state.OrderBook()
+    pause_positions = {}
+    pause_orders = {}
 
-    buy_orders = {}
-    sell_orders = {}
-    trading_state.pause_positions = {}
-    trading_state.pause_orders = {}
+    for order in orders:
+        # 适配器已返回 ccxt 格式订单，只对原始订单补做一次转换
+        # （重复转换会丢失 clientOrderId）
+        if "clientOrderId" not in order:
+            order = normalize_order_to_ccxt(order)
+        if order.get("status") != "open":
+            continue
 
-    for order in normalized_orders:
         order_id = str(order.get("clientOrderId") or order.get("id", ""))
-        side = order.get("side", "buy")
-        is_ask = side == "sell"
+        is_ask = order.get("side", "buy") == "sell"
         price = round(float(order.get("price", 0)), 6)
-        status = order.get("status")
         initial_base_amount = float(order.get("amount", 0))
 
-        if status != "open":
-            continue
-
         # 判断订单是否在平仓侧
         is_close_side_order = is_ask == CLOSE_SIDE_IS_ASK
 
-        if is_close_side_order and initial_base_amount > GRID_CONFIG["GRID_AMOUNT"]:
+        if is_close_side_order and initial_base_amount > GRID_AMOUNT:
             # 非网格订单，记录为熔断占位订单 (仅平仓方向且数量大于网格单量)
-            trading_state.pause_positions[price] = initial_base_amount
-            trading_state.pause_orders[order_id] = {
+            pause_positions[price] = initial_base_amount
+            pause_orders[order_id] = {
                 "price": price,
                 "amount": initial_base_amount,
             }
@@ -548,5 +530,7 @@ async def _sync_current_orders():
         else:
             buy_orders[order_id] = price
 
+    trading_state.pause_positions = pause_positions
+    trading_state.pause_orders = pause_orders
     trading_state.buy_orders = buy_orders
     trading_state.sell_orders = sell_orders
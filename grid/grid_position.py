@@ -12,7 +12,7 @@ from . import grid_state
 logger = logging.getLogger(__name__)
 
 
-async def _cal_position_highest_amount_price() -> float:
+def _cal_position_highest_amount_price() -> float:
     """
     计算"最远/亏损最大"的持仓成本价估算。
     
@@ -48,7 +48,7 @@ async def _cal_position_highest_amount_price() -> float:
     return round(target_price, 6)
 
 
-async def _highest_order_lost() -> float:
+def _highest_order_lost() -> float:
     """
     计算数量最大的仓位浮亏
     
@@ -59,7 +59,7 @@ async def _highest_order_lost() -> float:
     GRID_CONFIG = grid_state.GRID_CONFIG
     OPEN_SIDE_IS_ASK = grid_state.OPEN_SIDE_IS_ASK
     
-    target_price = await _cal_position_highest_amount_price()
+    target_price = _cal_position_highest_amount_price()
 
     # 做多：(Entry - Current) * Amount. If Entry > Current, diff > 0 (Loss).
     # 做空：(Current - Entry) * Amount. If Current > Entry, diff > 0 (Loss).
@@ -89,7 +89,7 @@ async def _reduce_position():
     # 只允许此比例的收益用来减仓，以保留收益
     REDUCE_MULTIPLIER = 0.7
 
-    highest_lost = round(await _highest_order_lost(), 6)
+    highest_lost = round(_highest_order_lost(), 6)
 
     # 如果没有浮亏（盈利状态），不需要用利润填坑
     if highest_lost < 0:
@@ -105,7 +105,7 @@ async def _reduce_position():
 
     # 降低占位订单交易数量，对数量最大的那个订单降低，以求平均
     if len(trading_state.pause_orders) > 0:
-        logger.info(f"占位订单: {trading_state.pause_orders}")
+        logger.info("占位订单: %s", trading_state.pause_orders)
         order_id, order_info = max(
             trading_state.pause_orders.items(), key=lambda item: item[1]["amount"]
         )
@@ -166,7 +166,7 @@ async def check_position_limits(position_size: float):
     GRID_CONFIG = grid_state.GRID_CONFIG
     
     trading_state.current_position_size = position_size
-    current_pause_position = await _get_current_pause_position()
+    current_pause_position = _get_current_pause_position()
     trading_state.available_position_size = round(
         trading_state.current_position_size - current_pause_position, 2
     )
@@ -193,6 +193,6 @@ async def check_position_limits(position_size: float):
 
     max_pos = GRID_CONFIG["MAX_POSITION"]
     if position_size > max_pos:
-        logger.warning(f"⚠️ 仓位超出限制: 当前={position_size}, 限制={max_pos}")
+        logger.warning("⚠️ 仓位超出限制: 当前=%s, 限制=%s", position_size, max_pos)
         # 网格交易暂停
         trading_state.grid_pause = True
@@ -5,18 +5,47 @@
 """
 
 import logging
+import time
 from typing import List, Optional, Tuple
 
 from . import grid_state
 
 logger = logging.getLogger(__name__)
-_POSITION_EPS = 1e-9
 
 
-def _max_close_orders_by_position(available_position_size: float, grid_amount: float) -> int:
-    if grid_amount <= 0:
-        return 0
-    return max(0, int((available_position_size + _POSITION_EPS) / grid_amount))
+def _step_past(price: float, bound: float, step: float, downward: bool) -> float:
+    """
+    按网格步长平移价格，直到严格越过边界价格
+
+    逐步 price -= step (downward) 或 price += step，每步保留2位小数，
+    与原有网格价格序列保持一致（步长来自 ATR，可能多于2位小数，
+    一次性按步数计算会与逐步取整产生几分钱的偏差）。
+    步长非正时原样返回；步长小到取整后无法推进时按最小价格单位(0.01)推进，避免死循环。
+
+    Args:
+        price: 起始价格
+        bound: 边界价格（当前价格）
+        step: 网格步长
+        downward: True 时要求结果 < bound，否则要求结果 > bound
+
+    Returns:
+        平移后的价格（保留2位小数）
+    """
+    if step <= 0:
+        return price
+    if downward:
+        while price >= bound:
+            next_price = round(price - step, 2)
+            if next_price >= price:
+                next_price = round(price - 0.01, 2)
+            price = next_price
+    else:
+        while price <= bound:
+            next_price = round(price + step, 2)
+            if next_price <= price:
+                next_price = round(price + 0.01, 2)
+            price = next_price
+    return price
 
 
 def calculate_grid_prices(
@@ -35,26 +64,12 @@ def calculate_grid_prices(
     Returns:
         开仓价格列表（已排序）
     """
-    OPEN_SIDE_IS_ASK = grid_state.OPEN_SIDE_IS_ASK
-    
-    open_prices = []
-
     # 价差比例（百分比转换为小数）
-    spread_decimal = grid_spread / 100
-
-    # 计算网格价格
-    for i in range(grid_count):
-        distance = (i + 1) * spread_decimal
-        if not OPEN_SIDE_IS_ASK:
-            # 做多: 开仓价格在当前价格 BELOW
-            price = current_price * (1 - distance)
-        else:
-            # 做空: 开仓价格在当前价格 ABOVE
-            price = current_price * (1 + distance)
-
-        open_prices.append(round(price, 2))
+    # 做多: 开仓价格在当前价格 BELOW；做空: 开仓价格在当前价格 ABOVE
+    step = grid_spread / 100 if grid_state.OPEN_SIDE_IS_ASK else -grid_spread / 100
 
-    # 排序价格（从低到高）
+    # 计算网格价格，并排序（从低到高）
+    open_prices = [round(current_price * (1 + (i + 1) * step), 2) for i in range(grid_count)]
     open_prices.sort()
 
     return open_prices
@@ -98,7 +113,34 @@ async def replenish_grid(filled_signal: bool, trade_price: float = 0.0):
             await _replenish_config_close_orders()
 
     except Exception:
-        logger.exception(f"补充网格订单时发生错误")
+        logger.exception("补充网格订单时发生错误")
+
+
+async def replenish_worker():
+    """
+    成交补单协程
+
+    唯一的成交补单执行者：按成交顺序逐笔取出并调用 replenish_grid，
+    保证同一时刻只有一个成交补单流程在修改挂单。每笔成交都会单独补单，不做合并。
+    补单期间持有 replenish_grid_lock，成交处理、定期撤单与兜底补单都会等待本笔补单完成。
+    """
+    trading_state = grid_state.trading_state
+    replenish_queue = grid_state.replenish_queue
+    replenish_grid_lock = grid_state.replenish_grid_lock
+
+    while True:
+        trade_price, is_close_side = await replenish_queue.get()
+        try:
+            # 补单期间跨 await 读写订单簿和可用仓位，持锁避免成交处理在中途修改
+            async with replenish_grid_lock:
+                # 以入队时的成交方向为准，避免被之后的成交覆盖
+                trading_state.last_filled_order_is_close_side = is_close_side
+                await replenish_grid(True, trade_price)
+            trading_state.last_replenish_time = time.time()
+        except Exception:
+            logger.exception("成交补单协程处理失败")
+        finally:
+            replenish_queue.task_done()
 
 
 async def _on_open_side_filled(trade_price: float = 0.0):
@@ -109,7 +151,7 @@ async def _on_open_side_filled(trade_price: float = 0.0):
         trade_price: 成交价格
     """
     trading_state = grid_state.trading_state
-    GRID_CONFIG = grid_state.GRID_CONFIG
+    GRID_COUNT = grid_state.GRID_CONFIG["GRID_COUNT"]
     
     # 如果上一次成交是平仓侧，则跳过
     if trading_state.last_filled_order_is_close_side:
@@ -121,14 +163,14 @@ async def _on_open_side_filled(trade_price: float = 0.0):
     # 1. 补充开仓单 (继续建仓)
     if (
         not trading_state.grid_pause
-        and trading_state.open_orders_count < GRID_CONFIG["GRID_COUNT"]
+        and trading_state.open_orders_count < GRID_COUNT
     ):
-        new_open_order = await _calc_next_open_side_open_order()
+        new_open_order = _calc_next_open_side_open_order()
         if new_open_order:
             orders.append(new_open_order)
 
     # 2. 补充平仓单 (配对止盈单)
-    new_close_order = await _calc_next_open_side_close_order(trade_price)
+    new_close_order = _calc_next_open_side_close_order(trade_price)
     if new_close_order:
         orders.append(new_close_order)
     else:
@@ -153,7 +195,7 @@ async def _on_open_side_filled(trade_price: float = 0.0):
             logger.error("开仓侧补充订单 place_multi_orders 失败")
 
 
-async def _calc_next_open_side_open_order() -> Optional[Tuple[bool, float, float]]:
+def _calc_next_open_side_open_order() -> Optional[Tuple[bool, float, float]]:
     """
     计算基于开仓侧方向的下一个开仓单 (Further into the trend)
     
@@ -161,7 +203,7 @@ async def _calc_next_open_side_open_order() -> Optional[Tuple[bool, float, float
         (is_ask, price, amount) 元组，或 None
     """
     trading_state = grid_state.trading_state
-    GRID_CONFIG = grid_state.GRID_CONFIG
+    GRID_AMOUNT = grid_state.GRID_CONFIG["GRID_AMOUNT"]
     OPEN_SIDE_IS_ASK = grid_state.OPEN_SIDE_IS_ASK
     
     # 获取"最远"的开仓价
@@ -169,9 +211,9 @@ async def _calc_next_open_side_open_order() -> Optional[Tuple[bool, float, float
 
     if trading_state.open_orders_count > 0:
         if not OPEN_SIDE_IS_ASK:  # 做多
-            furthest_price = min(trading_state.open_orders.values())
+            furthest_price = trading_state.open_orders.lowest()
         else:  # 做空
-            furthest_price = max(trading_state.open_orders.values())
+            furthest_price = trading_state.open_orders.highest()
     else:
         # 无开仓订单时的回退逻辑
         multiplier = -1 if not OPEN_SIDE_IS_ASK else 1
@@ -190,18 +232,19 @@ async def _calc_next_open_side_open_order() -> Optional[Tuple[bool, float, float
     # 做多: 新价格必须 < 当前价格
     # 做空: 新价格必须 > 当前价格
 
-    if not OPEN_SIDE_IS_ASK:  # 做多
-        while new_price >= trading_state.current_price:
-            new_price = round(new_price - trading_state.active_grid_signle_price, 2)
-    else:  # 做空
-        while new_price <= trading_state.current_price:
-            new_price = round(new_price + trading_state.active_grid_signle_price, 2)
+    # 做多向下、做空向上，越过当前价格
+    new_price = _step_past(
+        new_price,
+        trading_state.current_price,
+        trading_state.active_grid_signle_price,
+        downward=not OPEN_SIDE_IS_ASK,
+    )
 
-    amount = GRID_CONFIG["GRID_AMOUNT"]
+    amount = GRID_AMOUNT
     return (OPEN_SIDE_IS_ASK, new_price, amount)
 
 
-async def _calc_next_open_side_close_order(
+def _calc_next_open_side_close_order(
     trade_price: float = 0.0,
 ) -> Optional[Tuple[bool, float, float]]:
     """
@@ -214,7 +257,7 @@ async def _calc_next_open_side_close_order(
         (is_ask, price, amount) 元组，或 None
     """
     trading_state = grid_state.trading_state
-    GRID_CONFIG = grid_state.GRID_CONFIG
+    GRID_AMOUNT = grid_state.GRID_CONFIG["GRID_AMOUNT"]
     OPEN_SIDE_IS_ASK = grid_state.OPEN_SIDE_IS_ASK
     CLOSE_SIDE_IS_ASK = grid_state.CLOSE_SIDE_IS_ASK
     
@@ -225,17 +268,17 @@ async def _calc_next_open_side_close_order(
     nearest_close_price = None
     if trading_state.close_orders_count > 0:
         if not OPEN_SIDE_IS_ASK:  # 做多 (平仓=卖)
-            nearest_close_price = min(trading_state.close_orders.values())
+            nearest_close_price = trading_state.close_orders.lowest()
         else:  # 做空 (平仓=买)
-            nearest_close_price = max(trading_state.close_orders.values())
+            nearest_close_price = trading_state.close_orders.highest()
 
     # 2. 获取"最近"的开仓订单价格
     nearest_open_price = None
     if trading_state.open_orders_count > 0:
         if not OPEN_SIDE_IS_ASK:  # 做多
-            nearest_open_price = max(trading_state.open_orders.values())
+            nearest_open_price = trading_state.open_orders.highest()
         else:  # 做空
-            nearest_open_price = min(trading_state.open_orders.values())
+            nearest_open_price = trading_state.open_orders.lowest()
 
     # 默认值
     if nearest_close_price is None:
@@ -297,10 +340,10 @@ async def _calc_next_open_side_close_order(
 
     if not OPEN_SIDE_IS_ASK:  # 做多
         if trading_state.current_price < new_close_price:
-            return (CLOSE_SIDE_IS_ASK, new_close_price, GRID_CONFIG["GRID_AMOUNT"])
+            return (CLOSE_SIDE_IS_ASK, new_close_price, GRID_AMOUNT)
     else:  # 做空
         if trading_state.current_price > new_close_price:
-            return (CLOSE_SIDE_IS_ASK, new_close_price, GRID_CONFIG["GRID_AMOUNT"])
+            return (CLOSE_SIDE_IS_ASK, new_close_price, GRID_AMOUNT)
 
     return None
 
@@ -313,7 +356,7 @@ async def _on_close_side_filled(trade_price: float = 0.0):
         trade_price: 成交价格
     """
     trading_state = grid_state.trading_state
-    GRID_CONFIG = grid_state.GRID_CONFIG
+    GRID_AMOUNT = grid_state.GRID_CONFIG["GRID_AMOUNT"]
     
     # 如果上一次成交不是平仓侧（是开仓侧），则跳过
     if not trading_state.last_filled_order_is_close_side:
@@ -324,21 +367,19 @@ async def _on_close_side_filled(trade_price: float = 0.0):
 
     # 1. 补充开仓单 (Buy Back)
     if not trading_state.grid_pause:
-        new_open_order = await _calc_next_close_side_open_order()
+        new_open_order = _calc_next_close_side_open_order()
         if new_open_order:
             orders.append(new_open_order)
 
     # 2. 补充平仓单 (如果还有剩余仓位需要止盈)
-    current_close_orders_volume = (
-        trading_state.close_orders_count * GRID_CONFIG["GRID_AMOUNT"]
-    )
-
+    # 按仓位量严格比较：仓位不是单量整数倍时，剩余部分也允许多挂一单
+    close_orders_count = trading_state.close_orders_count
     if (
         trading_state.available_position_size
-        > current_close_orders_volume + GRID_CONFIG["GRID_AMOUNT"]
-        and trading_state.close_orders_count > 0
+        > close_orders_count * GRID_AMOUNT + GRID_AMOUNT
+        and close_orders_count > 0
     ):
-        new_close_order = await _calc_next_close_side_close_order()
+        new_close_order = _calc_next_close_side_close_order()
         if new_close_order:
             orders.append(new_close_order)
 
@@ -360,7 +401,7 @@ async def _on_close_side_filled(trade_price: float = 0.0):
             logger.error("平仓侧补充订单 place_multi_orders 失败")
 
 
-async def _calc_next_close_side_open_order() -> Optional[Tuple[bool, float, float]]:
+def _calc_next_close_side_open_order() -> Optional[Tuple[bool, float, float]]:
     """
     计算基于平仓侧成交后的补充开仓单 (Buy Back)
     
@@ -368,7 +409,7 @@ async def _calc_next_close_side_open_order() -> Optional[Tuple[bool, float, floa
         (is_ask, price, amount) 元组
     """
     trading_state = grid_state.trading_state
-    GRID_CONFIG = grid_state.GRID_CONFIG
+    GRID_AMOUNT = grid_state.GRID_CONFIG["GRID_AMOUNT"]
     OPEN_SIDE_IS_ASK = grid_state.OPEN_SIDE_IS_ASK
     
     # 做多: 我们卖高了，想低买回来
@@ -377,9 +418,9 @@ async def _calc_next_close_side_open_order() -> Optional[Tuple[bool, float, floa
     nearest_open_price = None
     if trading_state.open_orders_count > 0:
         if not OPEN_SIDE_IS_ASK:  # 做多
-            nearest_open_price = max(trading_state.open_orders.values())
+            nearest_open_price = trading_state.open_orders.highest()
         else:  # 做空
-            nearest_open_price = min(trading_state.open_orders.values())
+            nearest_open_price = trading_state.open_orders.lowest()
 
     if nearest_open_price is None:
         nearest_open_price = trading_state.current_price
@@ -390,10 +431,10 @@ async def _calc_next_close_side_open_order() -> Optional[Tuple[bool, float, floa
         nearest_open_price + (trading_state.active_grid_signle_price * multiplier), 2
     )
 
-    return (OPEN_SIDE_IS_ASK, new_open_price, GRID_CONFIG["GRID_AMOUNT"])
+    return (OPEN_SIDE_IS_ASK, new_open_price, GRID_AMOUNT)
 
 
-async def _calc_next_close_side_close_order() -> Optional[Tuple[bool, float, float]]:
+def _calc_next_close_side_close_order() -> Optional[Tuple[bool, float, float]]:
     """
     计算基于平仓侧成交后的补充平仓单 (Further Profit Taking)
     
@@ -401,7 +442,7 @@ async def _calc_next_close_side_close_order() -> Optional[Tuple[bool, float, flo
         (is_ask, price, amount) 元组
     """
     trading_state = grid_state.trading_state
-    GRID_CONFIG = grid_state.GRID_CONFIG
+    GRID_AMOUNT = grid_state.GRID_CONFIG["GRID_AMOUNT"]
     OPEN_SIDE_IS_ASK = grid_state.OPEN_SIDE_IS_ASK
     CLOSE_SIDE_IS_ASK = grid_state.CLOSE_SIDE_IS_ASK
     
@@ -411,9 +452,9 @@ async def _calc_next_close_side_close_order() -> Optional[Tuple[bool, float, flo
     furthest_close_price = None
     if trading_state.close_orders_count > 0:
         if not OPEN_SIDE_IS_ASK:  # 做多
-            furthest_close_price = max(trading_state.close_orders.values())
+            furthest_close_price = trading_state.close_orders.highest()
         else:  # 做空
-            furthest_close_price = min(trading_state.close_orders.values())
+            furthest_close_price = trading_state.close_orders.lowest()
 
     if furthest_close_price is None:
         furthest_close_price = trading_state.current_price
@@ -423,7 +464,7 @@ async def _calc_next_close_side_close_order() -> Optional[Tuple[bool, float, flo
         furthest_close_price + (trading_state.active_grid_signle_price * multiplier), 2
     )
 
-    return (CLOSE_SIDE_IS_ASK, new_close_price, GRID_CONFIG["GRID_AMOUNT"])
+    return (CLOSE_SIDE_IS_ASK, new_close_price, GRID_AMOUNT)
 
 
 async def _over_range_replenish_order():
@@ -442,9 +483,9 @@ async def _over_range_replenish_order():
     nearest_close_price = None
     if trading_state.close_orders_count > 0:
         if not OPEN_SIDE_IS_ASK:  # 做多
-            nearest_close_price = min(trading_state.close_orders.values())
+            nearest_close_price = trading_state.close_orders.lowest()
         else:  # 做空
-            nearest_close_price = max(trading_state.close_orders.values())
+            nearest_close_price = trading_state.close_orders.highest()
     else:
         multiplier = 1 if not OPEN_SIDE_IS_ASK else -1
         nearest_close_price = trading_state.current_price + (
@@ -455,9 +496,9 @@ async def _over_range_replenish_order():
     nearest_open_price = None
     if trading_state.open_orders_count > 0:
         if not OPEN_SIDE_IS_ASK:  # 做多
-            nearest_open_price = max(trading_state.open_orders.values())
+            nearest_open_price = trading_state.open_orders.highest()
         else:  # 做空
-            nearest_open_price = min(trading_state.open_orders.values())
+            nearest_open_price = trading_state.open_orders.lowest()
     else:
         multiplier = -1 if not OPEN_SIDE_IS_ASK else 1
         nearest_open_price = trading_state.current_price + (
@@ -490,10 +531,11 @@ async def _over_range_replenish_open_order(nearest_open_price: float):
         nearest_open_price: 最近的开仓价格
     """
     trading_state = grid_state.trading_state
-    GRID_CONFIG = grid_state.GRID_CONFIG
+    GRID_AMOUNT = grid_state.GRID_CONFIG["GRID_AMOUNT"]
+    MAX_TOTAL_ORDERS = grid_state.GRID_CONFIG["MAX_TOTAL_ORDERS"]
     OPEN_SIDE_IS_ASK = grid_state.OPEN_SIDE_IS_ASK
     
-    if trading_state.open_orders_count < GRID_CONFIG["MAX_TOTAL_ORDERS"]:
+    if trading_state.open_orders_count < MAX_TOTAL_ORDERS:
         # 如果上次成交是开仓侧且存在订单，不再补开仓单
         if (
             not trading_state.last_filled_order_is_close_side
@@ -519,14 +561,14 @@ async def _over_range_replenish_open_order(nearest_open_price: float):
         success, order_id = await trading_state.grid_trading.place_single_order(
             is_ask=OPEN_SIDE_IS_ASK,
             price=new_price,
-            amount=GRID_CONFIG["GRID_AMOUNT"],
+            amount=GRID_AMOUNT,
         )
         if success:
             if OPEN_SIDE_IS_ASK:
                 trading_state.sell_orders[order_id] = new_price
             else:
                 trading_state.buy_orders[order_id] = new_price
-            logger.info(f"大间距开仓补单成功: {order_id}, {new_price}")
+            logger.info("大间距开仓补单成功: %s, %s", order_id, new_price)
 
 
 async def _over_range_replenish_close_order(nearest_open_price: float):
@@ -537,7 +579,7 @@ async def _over_range_replenish_close_order(nearest_open_price: float):
         nearest_open_price: 最近的开仓价格
     """
     trading_state = grid_state.trading_state
-    GRID_CONFIG = grid_state.GRID_CONFIG
+    GRID_AMOUNT = grid_state.GRID_CONFIG["GRID_AMOUNT"]
     OPEN_SIDE_IS_ASK = grid_state.OPEN_SIDE_IS_ASK
     CLOSE_SIDE_IS_ASK = grid_state.CLOSE_SIDE_IS_ASK
     
@@ -568,14 +610,14 @@ async def _over_range_replenish_close_order(nearest_open_price: float):
     success, order_id = await trading_state.grid_trading.place_single_order(
         is_ask=CLOSE_SIDE_IS_ASK,
         price=new_price,
-        amount=GRID_CONFIG["GRID_AMOUNT"],
+        amount=GRID_AMOUNT,
     )
     if success:
         if CLOSE_SIDE_IS_ASK:
             trading_state.sell_orders[order_id] = new_price
         else:
             trading_state.buy_orders[order_id] = new_price
-        logger.info(f"大间距平仓补单成功: {order_id}, {new_price}")
+        logger.info("大间距平仓补单成功: %s, %s", order_id, new_price)
 
 
 async def _replenish_config_close_orders():
@@ -585,36 +627,30 @@ async def _replenish_config_close_orders():
     只向远距离补单。
     """
     trading_state = grid_state.trading_state
-    GRID_CONFIG = grid_state.GRID_CONFIG
+    GRID_AMOUNT = grid_state.GRID_CONFIG["GRID_AMOUNT"]
+    GRID_COUNT = grid_state.GRID_CONFIG["GRID_COUNT"]
     OPEN_SIDE_IS_ASK = grid_state.OPEN_SIDE_IS_ASK
     CLOSE_SIDE_IS_ASK = grid_state.CLOSE_SIDE_IS_ASK
     
-    max_close_orders = _max_close_orders_by_position(
-        trading_state.available_position_size,
-        GRID_CONFIG["GRID_AMOUNT"],
-    )
-
-    while (
-        trading_state.close_orders_count < GRID_CONFIG["GRID_COUNT"]
-        and trading_state.available_position_size
-        > trading_state.close_orders_count * GRID_CONFIG["GRID_AMOUNT"]
-        and trading_state.close_orders_count < max_close_orders
+    # 平仓单数量不超过网格数量，也不超过可用仓位可挂的数量（下单期间可能变化，每轮重新读取）
+    while trading_state.close_orders_count < min(
+        GRID_COUNT, trading_state.available_close_slots
     ):
         # 计算最远的平仓价格
         furthest_close_price = None
         if trading_state.close_orders_count > 0:
             if not OPEN_SIDE_IS_ASK:
-                furthest_close_price = max(trading_state.close_orders.values())
+                furthest_close_price = trading_state.close_orders.highest()
             else:
-                furthest_close_price = min(trading_state.close_orders.values())
+                furthest_close_price = trading_state.close_orders.lowest()
 
         if furthest_close_price is None:
             # 基于最近的开仓价格计算
             if trading_state.open_orders_count > 0:
                 if not OPEN_SIDE_IS_ASK:
-                    nearest_open = max(trading_state.open_orders.values())
+                    nearest_open = trading_state.open_orders.highest()
                 else:
-                    nearest_open = min(trading_state.open_orders.values())
+                    nearest_open = trading_state.open_orders.lowest()
             else:
                 nearest_open = trading_state.current_price - (
                     trading_state.active_grid_signle_price
@@ -634,21 +670,18 @@ async def _replenish_config_close_orders():
         )
 
         # 有效性检查
-        if not OPEN_SIDE_IS_ASK:
-            while new_price <= trading_state.current_price:
-                new_price = round(
-                    new_price + trading_state.active_grid_signle_price, 2
-                )
-        else:
-            while new_price >= trading_state.current_price:
-                new_price = round(
-                    new_price - trading_state.active_grid_signle_price, 2
-                )
+        # 做多平仓（卖）向上、做空平仓（买）向下，越过当前价格
+        new_price = _step_past(
+            new_price,
+            trading_state.current_price,
+            trading_state.active_grid_signle_price,
+            downward=OPEN_SIDE_IS_ASK,
+        )
 
         success, order_id = await trading_state.grid_trading.place_single_order(
             is_ask=CLOSE_SIDE_IS_ASK,
             price=new_price,
-            amount=GRID_CONFIG["GRID_AMOUNT"],
+            amount=GRID_AMOUNT,
         )
         if success:
             if CLOSE_SIDE_IS_ASK:
@@ -656,5 +689,5 @@ async def _replenish_config_close_orders():
             else:
                 trading_state.buy_orders[order_id] = new_price
         else:
-            logger.error(f"补充平仓单失败，退出循环。价格={new_price}")
+            logger.error("补充平仓单失败，退出循环。价格=%s", new_price)
             break
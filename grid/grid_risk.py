@@ -5,7 +5,8 @@
 """
 
 import logging
-from typing import Dict, Tuple
+from operator import itemgetter
+from typing import Dict, Optional, Tuple
 
 import pandas as pd
 
@@ -14,6 +15,73 @@ from . import quota
 
 logger = logging.getLogger(__name__)
 
+# 不利趋势检测参数（15分钟K线）
+TREND_MIN_BARS = 20
+TREND_EMA_PERIOD = 20
+TREND_RSI_PERIOD = 14
+TREND_ADX_PERIOD = 14
+TREND_ADX_THRESHOLD = 25  # ADX 高于此值视为存在明确趋势
+TREND_RSI_MID = 50
+
+# EMA 均值回归过滤参数
+EMA_REVERSION_PERIOD = 60
+EMA_REVERSION_THRESHOLD = 0.02  # 价格偏离 EMA 的相对距离
+
+# 急涨急跌检测参数（1分钟K线）
+RAPID_MOVE_ATR_PERIOD = 7
+RAPID_MOVE_THRESHOLD = 15.0  # 相对最新K线开盘价的绝对价格变动
+
+# 急涨急跌检测的K线基准缓存：(K线对象, ATR(7), 最新K线开盘价)
+# K线每10秒由主循环整体替换，行情推送之间只需比较对象即可复用
+_rapid_move_base_df: Optional[pd.DataFrame] = None
+_rapid_move_base: Tuple[float, float] = (0.0, 0.0)
+
+
+def _rapid_move_baseline(df: pd.DataFrame) -> Tuple[float, float]:
+    """返回 (ATR(7), 最新K线开盘价)，同一份K线只计算一次"""
+    global _rapid_move_base_df, _rapid_move_base
+
+    if df is not _rapid_move_base_df:
+        atr_series = quota.compute_atr(df, period=RAPID_MOVE_ATR_PERIOD)
+        _rapid_move_base = (float(atr_series.iat[-1]), float(df["open"].iat[-1]))
+        _rapid_move_base_df = df
+    return _rapid_move_base
+
+
+# 15分钟K线风控指标缓存：键为 (K线数, 首根时间, 末根时间, 末根收盘/最高/最低价)
+# 末根K线仍在形成中，其收盘、最高、最低价都会变化，需全部纳入键；
+# 键不变时指标结果一致，60秒一次的风控检查可直接复用
+_trend_check_key: Optional[tuple] = None
+_trend_check_result: Optional[Tuple[Tuple[bool, Dict], Tuple[bool, Dict]]] = None
+
+
+def _candle_cache_key(df: pd.DataFrame) -> Optional[tuple]:
+    """生成K线缓存键，数据为空或缺列时返回 None（不缓存）"""
+    if df is None or df.empty or "time" not in df:
+        return None
+    time_col = df["time"]
+    return (
+        len(df),
+        time_col.iat[0],
+        time_col.iat[-1],
+        float(df["close"].iat[-1]),
+        float(df["high"].iat[-1]),
+        float(df["low"].iat[-1]),
+    )
+
+
+def _check_trend_filters(
+    df: pd.DataFrame,
+) -> Tuple[Tuple[bool, Dict], Tuple[bool, Dict]]:
+    """返回 (不利趋势检测结果, EMA均值回归检测结果)，K线未变化时复用上次结果"""
+    global _trend_check_key, _trend_check_result
+
+    key = _candle_cache_key(df)
+    if key is None or key != _trend_check_key or _trend_check_result is None:
+        _trend_check_result = (_check_adverse_trend(df), _check_ema_reversion(df))
+        _trend_check_key = key
+    return _trend_check_result
+
 
 async def _risk_check(start: bool = False):
     """
@@ -35,15 +103,16 @@ async def _risk_check(start: bool = False):
 
     # 检测不利趋势 (Adverse Trend)
     # 做多：下跌趋势不利。做空：上涨趋势不利。
-    is_adverse, details = await _check_adverse_trend(cs_15m)
+    (is_adverse, details), (is_ema_filter, ema_filter_details) = _check_trend_filters(
+        cs_15m
+    )
 
     if is_adverse:
-        logger.info(f"⚠️ 警告：当前15分钟线处于不利趋势, 暂停交易, {details}")
+        logger.info("⚠️ 警告：当前15分钟线处于不利趋势, 暂停交易, %s", details)
 
-    is_ema_filter, ema_filter_details = await _check_ema_reversion(cs_15m)
     if is_ema_filter:
         logger.info(
-            f"⚠️ 警告：当前EMA均值回归趋势不利, 暂停交易, {ema_filter_details}"
+            "⚠️ 警告：当前EMA均值回归趋势不利, 暂停交易, %s", ema_filter_details
         )
     
     logger.info(
@@ -73,7 +142,7 @@ async def _risk_check(start: bool = False):
         and trading_state.available_position_size > GRID_CONFIG["GRID_AMOUNT"]
     ):
         # 已经熔断状态下如果还有可用仓位，下占位单
-        logger.info(f"开始创建占位订单。。。。。。。。。。。。")
+        logger.info("开始创建占位订单。。。。。。。。。。。。")
         await _save_pause_position()
 
     # 降仓逻辑按当前策略要求禁用（保留状态计算，不执行自动减仓）
@@ -82,7 +151,7 @@ async def _risk_check(start: bool = False):
     #     await _reduce_position()
 
 
-async def _check_adverse_trend(df: pd.DataFrame) -> Tuple[bool, Dict]:
+def _check_adverse_trend(df: pd.DataFrame) -> Tuple[bool, Dict]:
     """
     检测不利趋势
     
@@ -94,32 +163,32 @@ async def _check_adverse_trend(df: pd.DataFrame) -> Tuple[bool, Dict]:
     """
     OPEN_SIDE_IS_ASK = grid_state.OPEN_SIDE_IS_ASK
     
-    if df is None or len(df) < 20:
+    if df is None or len(df) < TREND_MIN_BARS:
         return False, {}
 
-    ema_series = quota.compute_ema(df, period=20)
-    rsi_series = quota.compute_rsi(df, period=14)
-    adx_series, pdi_series, mdi_series = quota.compute_adx(df, period=14)
+    ema_series = quota.compute_ema(df, period=TREND_EMA_PERIOD)
+    rsi_series = quota.compute_rsi(df, period=TREND_RSI_PERIOD)
+    adx_series, pdi_series, mdi_series = quota.compute_adx(df, period=TREND_ADX_PERIOD)
 
-    ema_value = float(ema_series.iloc[-1])
-    rsi_value = float(rsi_series.iloc[-1])
-    adx_value = float(adx_series.iloc[-1])
-    pdi_value = float(pdi_series.iloc[-1])
-    mdi_value = float(mdi_series.iloc[-1])
-    close_value = float(df["close"].iloc[-1])
+    ema_value = float(ema_series.iat[-1])
+    rsi_value = float(rsi_series.iat[-1])
+    adx_value = float(adx_series.iat[-1])
+    pdi_value = float(pdi_series.iat[-1])
+    mdi_value = float(mdi_series.iat[-1])
+    close_value = float(df["close"].iat[-1])
 
     # 是否存在明确趋势
-    has_trend = adx_value > 25
+    has_trend = adx_value > TREND_ADX_THRESHOLD
 
     if not OPEN_SIDE_IS_ASK:  # 做多策略：担心下跌趋势
         is_downtrend = close_value < ema_value
         is_bearish_adx = pdi_value < mdi_value
-        weak_rsi = rsi_value < 50
+        weak_rsi = rsi_value < TREND_RSI_MID
         result = is_downtrend and has_trend and is_bearish_adx and weak_rsi
     else:  # 做空策略：担心上涨趋势
         is_uptrend = close_value > ema_value
         is_bullish_adx = pdi_value > mdi_value
-        strong_rsi = rsi_value > 50
+        strong_rsi = rsi_value > TREND_RSI_MID
         result = is_uptrend and has_trend and is_bullish_adx and strong_rsi
 
     details = {
@@ -133,7 +202,7 @@ async def _check_adverse_trend(df: pd.DataFrame) -> Tuple[bool, Dict]:
     return result, details
 
 
-async def _check_ema_reversion(df: pd.DataFrame) -> Tuple[bool, Dict]:
+def _check_ema_reversion(df: pd.DataFrame) -> Tuple[bool, Dict]:
     """
     EMA 均值回归过滤器
     
@@ -148,16 +217,16 @@ async def _check_ema_reversion(df: pd.DataFrame) -> Tuple[bool, Dict]:
     """
     OPEN_SIDE_IS_ASK = grid_state.OPEN_SIDE_IS_ASK
     
-    if df is None or len(df) < 60:
+    if df is None or len(df) < EMA_REVERSION_PERIOD:
         return False, {}
 
-    ema_60 = quota.compute_ema(df, period=60, column="close")
-    ema_value = float(ema_60.iloc[-1])
-    current_price = float(df["close"].iloc[-1])
+    ema_60 = quota.compute_ema(df, period=EMA_REVERSION_PERIOD, column="close")
+    ema_value = float(ema_60.iat[-1])
+    current_price = float(df["close"].iat[-1])
 
     distance = (current_price - ema_value) / ema_value
 
-    threshold = 0.02
+    threshold = EMA_REVERSION_THRESHOLD
     is_triggered = False
 
     if not OPEN_SIDE_IS_ASK:  # 做多
@@ -170,7 +239,7 @@ async def _check_ema_reversion(df: pd.DataFrame) -> Tuple[bool, Dict]:
     return is_triggered, {"distance": round(distance, 4), "threshold": threshold}
 
 
-async def is_rapid_market_move(df: pd.DataFrame, close: float) -> Tuple[bool, Dict]:
+def is_rapid_market_move(df: pd.DataFrame, close: float) -> Tuple[bool, Dict]:
     """
     急跌/急涨检测
     
@@ -186,17 +255,15 @@ async def is_rapid_market_move(df: pd.DataFrame, close: float) -> Tuple[bool, Di
     """
     OPEN_SIDE_IS_ASK = grid_state.OPEN_SIDE_IS_ASK
     
-    if df is None:
+    # K线不足（含拉取失败返回的空表）时 ATR 仍在预热期，直接跳过
+    if df is None or len(df) < RAPID_MOVE_ATR_PERIOD:
         return False, {}
 
-    atr_series = quota.compute_atr(df, period=7)
-    atr_value = float(atr_series.iloc[-1])
-
-    open_val = float(df["open"].iloc[-1])
+    atr_value, open_val = _rapid_move_baseline(df)
 
     change = close - open_val
 
-    threshold = 15.0  # 阈值
+    threshold = RAPID_MOVE_THRESHOLD
 
     triggered = False
     if not OPEN_SIDE_IS_ASK:  # 做多
@@ -443,8 +510,7 @@ def _calculate_order_prices(
     # 计算上方和下方的订单数量分配
     # 为了让上方挂单量 >= 下方，我们把数量较大的订单放在上方
     # 先按数量降序排序，较大的放上方
-    indexed_amounts = list(enumerate(order_amounts))
-    indexed_amounts.sort(key=lambda x: x[1], reverse=True)
+    indexed_amounts = sorted(enumerate(order_amounts), key=itemgetter(1), reverse=True)
     
     # 计算每个价格位置（相对于回本价格的偏移）
     # 位置0在回本价格，正数在上方，负数在下方
@@ -471,7 +537,7 @@ def _calculate_order_prices(
     return result_prices
 
 
-async def _get_current_pause_position() -> float:
+def _get_current_pause_position() -> float:
     """
     获取当前价格下熔断占位仓位
     
@@ -484,17 +550,14 @@ async def _get_current_pause_position() -> float:
     if len(trading_state.pause_positions) == 0:
         return 0
     
-    total = 0
-    for price, amount in trading_state.pause_positions.items():
-        # 只计算未到达的价格的订单
-        # 做多（卖单）：Pending if Price > Current
-        # 做空（买单）：Pending if Price < Current
-
-        if not OPEN_SIDE_IS_ASK:
-            if price > trading_state.current_price:
-                total += amount
-        else:
-            if price < trading_state.current_price:
-                total += amount
+    # 只计算未到达的价格的订单
+    # 做多（卖单）：Pending if Price > Current
+    # 做空（买单）：Pending if Price < Current
+    current_price = trading_state.current_price
+    pause_items = trading_state.pause_positions.items()
+    if not OPEN_SIDE_IS_ASK:
+        total = sum(amount for price, amount in pause_items if price > current_price)
+    else:
+        total = sum(amount for price, amount in pause_items if price < current_price)
 
     return round(total, 6)
@@ -6,7 +6,8 @@
 
 import asyncio
 import time
-from typing import Dict, List, Optional
+from bisect import bisect_left, insort
+from typing import Dict, Iterator, List, Optional, Tuple
 import pandas as pd
 
 from .grid_trading import GridTrading
@@ -20,12 +21,147 @@ DIRECTION = "LONG"  # Default
 OPEN_SIDE_IS_ASK = False
 CLOSE_SIDE_IS_ASK = True
 
+# 价格定点精度：价格 * PRICE_SCALE 取整后比较，避免反复 round 浮点数
+PRICE_SCALE = 10_000
+
+
+def price_to_ticks(price: float) -> int:
+    """将价格转换为整数刻度（精度 1 / PRICE_SCALE）"""
+    return int(round(price * PRICE_SCALE))
+
+
+# 收益定点精度：价格精度 * 数量精度，累加时不产生浮点误差
+QTY_SCALE = 10_000
+PROFIT_SCALE = PRICE_SCALE * QTY_SCALE
+
+
+# 仓位比较容差
+_POSITION_EPS = 1e-9
+
+
+def max_close_orders_by_position(available_position_size: float, grid_amount: float) -> int:
+    """可用仓位最多可以挂出的平仓单数量"""
+    if grid_amount <= 0:
+        return 0
+    return max(0, int((available_position_size + _POSITION_EPS) / grid_amount))
+
+
+class OrderBook(dict):
+    """
+    按价格有序的订单字典
+
+    仍是 订单ID -> 价格 的 dict，同时维护一个按 (价格, 订单ID) 排序的列表，
+    最高/最低价为 O(1)，有序遍历无需每次 sorted()。
+    遍历 sorted_items() 期间不要修改订单簿。
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._sorted: List[Tuple[float, str]] = []
+        self.update(*args, **kwargs)
+
+    def _discard_sorted(self, order_id: str, price: float) -> None:
+        entry = (price, order_id)
+        i = bisect_left(self._sorted, entry)
+        if i < len(self._sorted) and self._sorted[i] == entry:
+            del self._sorted[i]
+
+    def __setitem__(self, order_id: str, price: float) -> None:
+        if order_id in self:
+            self._discard_sorted(order_id, dict.__getitem__(self, order_id))
+        dict.__setitem__(self, order_id, price)
+        insort(self._sorted, (price, order_id))
+
+    def __delitem__(self, order_id: str) -> None:
+        price = dict.__getitem__(self, order_id)
+        dict.__delitem__(self, order_id)
+        self._discard_sorted(order_id, price)
+
+    def pop(self, order_id: str, *default):
+        if order_id in self:
+            price = dict.__getitem__(self, order_id)
+            del self[order_id]
+            return price
+        if default:
+            return default[0]
+        raise KeyError(order_id)
+
+    def popitem(self) -> Tuple[str, float]:
+        order_id, price = dict.popitem(self)
+        self._discard_sorted(order_id, price)
+        return order_id, price
+
+    def setdefault(self, order_id: str, price: float = None):
+        if order_id not in self:
+            self[order_id] = price
+        return dict.__getitem__(self, order_id)
+
+    def update(self, *args, **kwargs) -> None:
+        for order_id, price in dict(*args, **kwargs).items():
+            self[order_id] = price
+
+    def clear(self) -> None:
+        dict.clear(self)
+        self._sorted.clear()
+
+    def copy(self) -> "OrderBook":
+        return OrderBook(self)
+
+    def lowest(self) -> Optional[float]:
+        """最低挂单价，空时返回 None"""
+        return self._sorted[0][0] if self._sorted else None
+
+    def highest(self) -> Optional[float]:
+        """最高挂单价，空时返回 None"""
+        return self._sorted[-1][0] if self._sorted else None
+
+    def nearest(self, price: float) -> Optional[Tuple[str, float]]:
+        """价格最接近 price 的挂单，返回 (订单ID, 挂单价)，空时返回 None"""
+        entries = self._sorted
+        if not entries:
+            return None
+        i = bisect_left(entries, (price,))
+        if i == 0:
+            best = entries[0]
+        elif i == len(entries):
+            best = entries[-1]
+        else:
+            below, above = entries[i - 1], entries[i]
+            best = below if price - below[0] <= above[0] - price else above
+        return best[1], best[0]
+
+    def sorted_items(self, reverse: bool = False) -> Iterator[Tuple[str, float]]:
+        """按价格遍历 (订单ID, 价格)，reverse=True 时从高到低"""
+        entries = reversed(self._sorted) if reverse else self._sorted
+        for price, order_id in entries:
+            yield order_id, price
+
 
 class GridTradingState:
     """网格交易全局状态管理类"""
 
+    # 固定属性集合：属性访问走槽位偏移，并防止拼写错误时静默新增属性
+    __slots__ = (
+        "current_price", "last_stats_check_time",
+        "last_stats_check_price", "is_running", "grid_trading", "open_prices",
+        "buy_orders", "sell_orders", "original_open_prices", "base_grid_single_price",
+        "active_grid_signle_price", "start_collateral", "current_collateral",
+        "start_time", "open_price", "last_filled_order_is_close_side",
+        "last_replenish_time", "last_trade_price", "grid_pause",
+        "grid_close_spread_alert", "grid_open_spread_alert", "grid_decrease_status",
+        "current_position_size", "current_position_sign", "filled_count",
+        "candle_stick_1m", "current_atr", "pause_positions", "pause_orders",
+        "pause_position_exist", "_available_position_size", "available_close_slots",
+        "_active_profit", "_total_profit", "_available_reduce_profit",
+        "processed_trade_keys", "recent_filled_order_ids", "trade_reconcile_seeded",
+        "placing_pause_order", "last_report_time", "last_report_collateral",
+        "last_report_price", "last_report_filled_count",
+    )
+
     def __init__(self):
         self.current_price: Optional[float] = None
+        self.last_stats_check_time: float = 0  # 上次行情推送风控检测时间 (monotonic)
+        self.last_stats_check_price: float = 0  # 上次行情推送风控检测价格
         self.is_running: bool = False
         self.grid_trading: Optional[GridTrading] = None  # 网格交易实例
         
@@ -33,8 +169,8 @@ class GridTradingState:
         self.open_prices: List[float] = []  # 开仓价格列表（有序）
         
         # 买卖订单映射
-        self.buy_orders: dict[str, float] = {}  # 买单订单ID到价格映射
-        self.sell_orders: dict[str, float] = {}  # 卖单订单ID到价格映射
+        self.buy_orders: OrderBook = OrderBook()  # 买单订单ID到价格映射
+        self.sell_orders: OrderBook = OrderBook()  # 卖单订单ID到价格映射
 
         # 原始价格序列（用于参考）
         self.original_open_prices: List[float] = []  # 原始开仓价格序列
@@ -67,23 +203,76 @@ class GridTradingState:
         self.pause_orders: dict[str, dict[str, float]] = {}  # 占位订单ID到价格与数量的映射
         self.pause_position_exist: bool = False  # 记录本次是否已经进行了熔断占位仓位下单
         
-        self.available_position_size: float = 0.0  # 可用仓位
-        self.active_profit: float = 0.0  # 动态网格收益
-        self.total_profit: float = 0.0  # 本次运行总收益
-        self.available_reduce_profit: float = 0.0  # 可用来减仓的收益
+        self._available_position_size: float = 0.0  # 可用仓位
+        self.available_close_slots: int = 0  # 可用仓位可挂平仓单数量，随可用仓位更新
+        # 收益以 1 / PROFIT_SCALE 为单位的整数保存，对外通过属性按浮点读写
+        self._active_profit: int = 0  # 动态网格收益
+        self._total_profit: int = 0  # 本次运行总收益
+        self._available_reduce_profit: int = 0  # 可用来减仓的收益
         self.processed_trade_keys: set[str] = set()  # REST成交去重键
         self.recent_filled_order_ids: set[str] = set()  # 最近已处理的成交订单ID
         self.trade_reconcile_seeded: bool = False  # 首次对账仅建立基线，不触发补单
 
         self.placing_pause_order: bool = False  # 是否正在进行熔断占位下单 (防止重入)
 
+        # 上次输出运行报告时的快照（无变化时不重复输出）
+        self.last_report_time: float = 0
+        self.last_report_collateral: Optional[float] = None
+        self.last_report_price: Optional[float] = None
+        self.last_report_filled_count: int = 0
+
+    @property
+    def available_position_size(self) -> float:
+        """可用仓位"""
+        return self._available_position_size
+
+    @available_position_size.setter
+    def available_position_size(self, value: float) -> None:
+        self._available_position_size = value
+        grid_amount = GRID_CONFIG["GRID_AMOUNT"] if GRID_CONFIG else 0.0
+        self.available_close_slots = max_close_orders_by_position(value, grid_amount)
+
+    @property
+    def active_profit(self) -> float:
+        """动态网格收益"""
+        return self._active_profit / PROFIT_SCALE
+
+    @active_profit.setter
+    def active_profit(self, value: float) -> None:
+        self._active_profit = int(round(value * PROFIT_SCALE))
+
+    @property
+    def total_profit(self) -> float:
+        """本次运行总收益"""
+        return self._total_profit / PROFIT_SCALE
+
+    @total_profit.setter
+    def total_profit(self, value: float) -> None:
+        self._total_profit = int(round(value * PROFIT_SCALE))
+
+    @property
+    def available_reduce_profit(self) -> float:
+        """可用来减仓的收益"""
+        return self._available_reduce_profit / PROFIT_SCALE
+
+    @available_reduce_profit.setter
+    def available_reduce_profit(self, value: float) -> None:
+        self._available_reduce_profit = int(round(value * PROFIT_SCALE))
+
+    def add_grid_profit(self, profit: float) -> None:
+        """记录一次网格套利收益，同时计入动态、总收益和可减仓收益"""
+        units = int(round(profit * PROFIT_SCALE))
+        self._active_profit += units
+        self._total_profit += units
+        self._available_reduce_profit += units
+
     @property
-    def open_orders(self) -> dict[str, float]:
+    def open_orders(self) -> OrderBook:
         """返回开仓侧的订单字典"""
         return self.sell_orders if OPEN_SIDE_IS_ASK else self.buy_orders
 
     @property
-    def close_orders(self) -> dict[str, float]:
+    def close_orders(self) -> OrderBook:
         """返回平仓侧的订单字典"""
         return self.buy_orders if OPEN_SIDE_IS_ASK else self.sell_orders
 
@@ -101,7 +290,9 @@ class GridTradingState:
 # 全局状态实例
 trading_state = GridTradingState()
 
-# 全局异步锁，用于保护 replenish_grid() 方法
+# 成交补单队列：(成交价格, 是否平仓侧成交)，由 replenish_worker 逐笔串行处理
+replenish_queue: asyncio.Queue = asyncio.Queue()
+# 订单簿/可用仓位锁：成交处理修改订单簿与补单协程的 replenish_grid（跨 await 读写订单簿）互斥
 replenish_grid_lock = asyncio.Lock()
 
 
@@ -128,9 +319,11 @@ def set_grid_config(config: dict) -> None:
     """设置网格配置"""
     global GRID_CONFIG
     GRID_CONFIG = config
+    # 配置前写入的可用仓位按新的 GRID_AMOUNT 重新计算平仓单槽位
+    trading_state.available_position_size = trading_state.available_position_size
 
 
-async def seconds_formatter(seconds: int) -> str:
+def seconds_formatter(seconds: int) -> str:
     """
     将秒数格式化为可读的时间字符串
     
@@ -140,7 +333,7 @@ async def seconds_formatter(seconds: int) -> str:
     Returns:
         格式化的时间字符串，如 "1天 2小时 30分钟 45秒"
     """
-    days, seconds = divmod(seconds, 86400)
+    days, seconds = divmod(int(seconds), 86400)
     hours, seconds = divmod(seconds, 3600)
     minutes, seconds = divmod(seconds, 60)
-    return f"{round(days)}天 {round(hours)}小时 {round(minutes)}分钟 {round(seconds)}秒"
+    return f"{days}天 {hours}小时 {minutes}分钟 {seconds}秒"
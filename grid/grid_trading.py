@@ -1,4 +1,6 @@
+import asyncio
 import logging
+import math
 import pandas as pd
 from typing import Any, Dict, List, Tuple, Optional
 from . import quota
@@ -246,11 +248,12 @@ class GridTrading:
             from exchanges.common_market_data import BinanceMarketData
             binance_data = BinanceMarketData()
             
-            # Get klines from Binance
-            df = binance_data.get_klines_df(
+            # Get klines from Binance (blocking HTTP + DataFrame build, run off the event loop)
+            df = await asyncio.to_thread(
+                binance_data.get_klines_df,
                 symbol=binance_symbol,
                 interval=binance_interval,
-                limit=count_back
+                limit=count_back,
             )
             
             # Rename columns to match expected format
@@ -288,12 +291,12 @@ class GridTrading:
         rsi_series = quota.compute_rsi(df, period=rsi_period)
         adx_series, pdi_series, mdi_series = quota.compute_adx(df, period=adx_period)
 
-        ema_value = float(ema_series.iloc[-1])
-        rsi_value = float(rsi_series.iloc[-1])
-        adx_value = float(adx_series.iloc[-1])
-        pdi_value = float(pdi_series.iloc[-1])
-        mdi_value = float(mdi_series.iloc[-1])
-        close_value = float(df["close"].iloc[-1])
+        ema_value = float(ema_series.iat[-1])
+        rsi_value = float(rsi_series.iat[-1])
+        adx_value = float(adx_series.iat[-1])
+        pdi_value = float(pdi_series.iat[-1])
+        mdi_value = float(mdi_series.iat[-1])
+        close_value = float(df["close"].iat[-1])
 
         is_downtrend = close_value < ema_value
         has_trend = adx_value > 25 and pdi_value < mdi_value
@@ -324,15 +327,17 @@ class GridTrading:
             logger.warning("急跌检测数据不足")
             return False, {"reason": "insufficient_data"}
 
-        atr_series = quota.compute_atr(df, period=atr_period)
-        atr_ma_series = atr_series.rolling(window=atr_ma_period).mean()
+        atr_values = quota.compute_atr(df, period=atr_period).to_numpy()
 
-        atr_value = float(atr_series.iloc[-1])
-        atr_ma_value = float(atr_ma_series.iloc[-1]) if not pd.isna(atr_ma_series.iloc[-1]) else 0.0
+        atr_value = float(atr_values[-1])
+        # 只需要最后一个窗口的均值，窗口内含 NaN 时与 rolling().mean() 一样视为无效
+        atr_ma_value = float(atr_values[-atr_ma_period:].mean())
+        if math.isnan(atr_ma_value):
+            atr_ma_value = 0.0
         atr_multiplier = atr_value / atr_ma_value if atr_ma_value else float("inf")
 
-        latest_open = float(df["open"].iloc[-1])
-        latest_close = float(df["close"].iloc[-1])
+        latest_open = float(df["open"].iat[-1])
+        latest_close = float(df["close"].iat[-1])
         if close is not None:
             latest_close = close
         fall_amount = latest_open - latest_close
@@ -365,7 +370,7 @@ class GridTrading:
             return None
 
         atr_series = quota.compute_atr(df, period=atr_period)
-        atr_value = float(atr_series.iloc[-1])
+        atr_value = float(atr_series.iat[-1])
         return atr_value
     
     async def ema_mean_reversion_filter(
@@ -391,10 +396,10 @@ class GridTrading:
         try:
             # 计算15分钟EMA60
             ema_60 = quota.compute_ema(df, period=60, column="close")
-            ema_value = float(ema_60.iloc[-1])
+            ema_value = float(ema_60.iat[-1])
             
             # 获取当前价格（最新收盘价）
-            current_price = float(df["close"].iloc[-1])
+            current_price = float(df["close"].iat[-1])
             
             # 计算乖离率
             distance = (current_price - ema_value) / ema_value
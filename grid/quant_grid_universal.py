@@ -4,7 +4,8 @@
 支持做多和做空两种方向的网格交易策略。
 """
 
-from common.config import PROXY_URL
+from common.config import PROXY_URL, METRICS_PORT
+from common.metrics import start_metrics_server, record_runtime
 
 import logging
 from common.logging_config import setup_logging
@@ -16,6 +17,8 @@ import asyncio
 import time
 from typing import Optional
 
+import aiohttp
+
 from .grid_trading import GridTrading
 from exchanges import create_exchange_adapter
 
@@ -25,10 +28,11 @@ from .grid_state import (
     GRID_CONFIG,
     OPEN_SIDE_IS_ASK,
     CLOSE_SIDE_IS_ASK,
-    replenish_grid_lock,
     configure_direction,
     set_grid_config,
     seconds_formatter,
+    replenish_queue,
+    replenish_grid_lock,
 )
 
 # 导入仓位管理模块
@@ -50,9 +54,62 @@ from .grid_risk import (
 # 导入网格补单模块
 from .grid_replenish import (
     replenish_grid,
+    replenish_worker,
     calculate_grid_prices,
 )
 
+# 运行报告：资产/价格变化小于该比例视为无变化
+REPORT_CHANGE_EPS = 1e-4
+# 运行报告：无变化时的最长静默时间（秒）
+REPORT_HEARTBEAT_SEC = 300
+
+# 行情推送节流：两次急涨急跌检测的最短间隔（秒），价格相对变化超过阈值时不受限
+STATS_CHECK_INTERVAL_SEC = 0.1
+STATS_CHECK_PRICE_EPS = 5e-4
+
+# 日志模板（%-style，由 logging 延迟格式化）
+_MSG_REPORT = (
+    "\n"
+    "════════════════════ 策略运行报告 ════════════════════\n"
+    "[资产情况] 初始: %.6f | 当前: %.6f | 盈亏: %.6f\n"
+    "[收益统计] 套利: %-8.2f | 动态: %-8.2f | 减仓: %-8.2f\n"
+    "[仓位管理] 当前: %-8s | 冻结: %-8s | 可用: %-8s\n"
+    "[运行状态] 耗时: %-8s | 成交: %-8s | 间距: %-8.2f\n"
+    "[市场行情] 开仓: %-8s | 当前: %-8s\n"
+    "[活跃订单] 买单: %s | 卖单: %s\n"
+    "════════════════════════════════════════════════════"
+)
+_MSG_STOP_SIGNAL = "👋 收到停止信号"
+_MSG_SYSTEM_STOPPED = "🔚 网格交易系统已停止"
+
+
+def _should_emit_report(unrealized_collateral: float, now: float) -> bool:
+    """
+    判断是否需要输出运行报告
+
+    资产、价格、成交数均无变化时跳过，但至少每 REPORT_HEARTBEAT_SEC 秒输出一次。
+
+    Args:
+        unrealized_collateral: 当前含浮盈亏的保证金
+        now: 当前时间戳
+
+    Returns:
+        是否输出
+    """
+    last_collateral = trading_state.last_report_collateral
+    last_price = trading_state.last_report_price
+    current_price = trading_state.current_price
+
+    if last_collateral is None or not last_price or not current_price:
+        return True
+    if now - trading_state.last_report_time >= REPORT_HEARTBEAT_SEC:
+        return True
+    if trading_state.filled_count != trading_state.last_report_filled_count:
+        return True
+    if abs(unrealized_collateral - last_collateral) > REPORT_CHANGE_EPS:
+        return True
+    return abs(current_price - last_price) / last_price > REPORT_CHANGE_EPS
+
 
 async def on_market_stats_update(market_id: str, market_stats: dict):
     """
@@ -68,11 +125,23 @@ async def on_market_stats_update(market_id: str, market_stats: dict):
     if mark_price:
         trading_state.current_price = mark_price
 
+        # 节流：间隔过短且价格变化不大时跳过检测，仅更新最新价格
+        now = time.monotonic()
+        last_check_price = trading_state.last_stats_check_price
+        if (
+            now - trading_state.last_stats_check_time < STATS_CHECK_INTERVAL_SEC
+            and last_check_price
+            and abs(mark_price - last_check_price) / last_check_price <= STATS_CHECK_PRICE_EPS
+        ):
+            return
+        trading_state.last_stats_check_time = now
+        trading_state.last_stats_check_price = mark_price
+
         cs_1m = trading_state.candle_stick_1m
         if trading_state.grid_trading is not None and cs_1m is not None:
             try:
                 # 急跌/暴涨检测
-                is_rapid_move, details = await is_rapid_market_move(cs_1m, close=mark_price)
+                is_rapid_move, details = is_rapid_market_move(cs_1m, close=mark_price)
 
                 if is_rapid_move:
                     min_step = trading_state.base_grid_single_price
@@ -83,7 +152,7 @@ async def on_market_stats_update(market_id: str, market_stats: dict):
                         min_step, min(raw_step, max_step)
                     )
             except Exception as e:
-                logger.exception(f"Error checking rapid move in market stats update: {e}")
+                logger.exception("Error checking rapid move in market stats update: %s", e)
 
 
 async def on_account_all_orders_update(account_id: str, orders: dict):
@@ -311,6 +380,8 @@ async def run_grid_trading(_exchange_type: str = "standx", grid_config: dict = N
     )
 
     trading_state.grid_trading = grid_trading
+    start_metrics_server(METRICS_PORT)
+    replenish_task: Optional[asyncio.Task] = None
 
     try:
         await asyncio.sleep(2)
@@ -319,16 +390,26 @@ async def run_grid_trading(_exchange_type: str = "standx", grid_config: dict = N
             logger.exception("网格交易初始化失败，退出")
             return
 
+        replenish_task = asyncio.create_task(replenish_worker())
+
         counter = 0
+        log_info = logger.info
+        time_time = time.time
         while trading_state.is_running:
             try:
                 # 每10秒打印一次网格状态
                 await asyncio.sleep(10)
 
-                # 检查仓位状态
-                account_info = await exchange.get_account_info()
+                # 检查仓位状态，同时拉取1分钟K线（两者互不依赖，并发请求）
+                account_info, cs_1m = await asyncio.gather(
+                    exchange.get_account_info(),
+                    grid_trading.candle_stick(
+                        market_id=CONFIG["MARKET_ID"],
+                        resolution="1m",
+                    ),
+                )
                 if not account_info:
-                    logger.info("获取账户信息失败")
+                    log_info("获取账户信息失败")
                     continue
                 positions = account_info.get("positions", {})
 
@@ -367,51 +448,57 @@ async def run_grid_trading(_exchange_type: str = "standx", grid_config: dict = N
                 )
 
                 # 检查当前账户保证金
-                trading_state.current_collateral = float(
+                current_collateral = float(
                     account_info.get("total_equity") or account_info.get("collateral", 0)
                 )
+                start_collateral = trading_state.start_collateral
+                trading_state.current_collateral = current_collateral
+
+                unrealized_collateral = current_collateral + unrealized_pnl
+                pnl = unrealized_collateral - start_collateral
+
+                now = time_time()
+                record_runtime(pnl, trading_state.current_price, now - trading_state.start_time)
+                if _should_emit_report(unrealized_collateral, now):
+                    trading_state.last_report_time = now
+                    trading_state.last_report_collateral = unrealized_collateral
+                    trading_state.last_report_price = trading_state.current_price
+                    trading_state.last_report_filled_count = trading_state.filled_count
+
+                    from .grid_risk import _get_current_pause_position
+                    current_pause_position = _get_current_pause_position()
+                    time_formatted = seconds_formatter(
+                        now - trading_state.start_time
+                    )
+                    log_info(
+                        _MSG_REPORT,
+                        start_collateral,
+                        unrealized_collateral,
+                        pnl,
+                        trading_state.total_profit,
+                        trading_state.active_profit,
+                        trading_state.available_reduce_profit,
+                        position_size,
+                        current_pause_position,
+                        trading_state.available_position_size,
+                        time_formatted,
+                        trading_state.filled_count,
+                        trading_state.active_grid_signle_price,
+                        trading_state.open_price,
+                        trading_state.current_price,
+                        trading_state.buy_orders,
+                        trading_state.sell_orders,
+                    )
 
-                unrealized_collateral = trading_state.current_collateral + unrealized_pnl
-                pnl = unrealized_collateral - trading_state.start_collateral
-
-                from .grid_risk import _get_current_pause_position
-                current_pause_position = await _get_current_pause_position()
-                time_formatted = await seconds_formatter(
-                    time.time() - trading_state.start_time
-                )
-                # 美化日志输出
-                log_pnl = round(pnl, 6)
-                log_total_profit = round(trading_state.total_profit, 2)
-                log_active_profit = round(trading_state.active_profit, 2)
-                log_reduce_profit = round(trading_state.available_reduce_profit, 2)
-                log_grid_step = round(trading_state.active_grid_signle_price, 2)
-                
-                logger.info(
-                    f"\n"
-                    f"════════════════════ 策略运行报告 ════════════════════\n"
-                    f"[资产情况] 初始: {round(trading_state.start_collateral, 6)} | 当前: {round(unrealized_collateral, 6)} | 盈亏: {log_pnl}\n"
-                    f"[收益统计] 套利: {log_total_profit:<8} | 动态: {log_active_profit:<8} | 减仓: {log_reduce_profit:<8}\n"
-                    f"[仓位管理] 当前: {position_size:<8} | 冻结: {current_pause_position:<8} | 可用: {trading_state.available_position_size:<8}\n"
-                    f"[运行状态] 耗时: {time_formatted:<8} | 成交: {trading_state.filled_count:<8} | 间距: {log_grid_step:<8}\n"
-                    f"[市场行情] 开仓: {trading_state.open_price:<8} | 当前: {trading_state.current_price:<8}\n"
-                    f"[活跃订单] 买单: {trading_state.buy_orders} | 卖单: {trading_state.sell_orders}\n"
-                    f"════════════════════════════════════════════════════"
-                )
-
-                # 获取K线数据
-                cs_1m = await grid_trading.candle_stick(
-                    market_id=CONFIG["MARKET_ID"],
-                    resolution="1m",
-                )
                 trading_state.candle_stick_1m = cs_1m
 
                 # 急跌/急涨 判断 (Rapid Market Move)
                 if trading_state.current_price:
-                    is_rapid, details = await is_rapid_market_move(
+                    is_rapid, details = is_rapid_market_move(
                         cs_1m, trading_state.current_price
                     )
                     if is_rapid:
-                        logger.info(f"⚠️ 警告：当前市场剧烈波动中, {details}")
+                        log_info("⚠️ 警告：当前市场剧烈波动中, %s", details)
 
                     # 波动检测 (Dynamic Step Adjustment)
                     atr_value = details.get("atr", 0)
@@ -425,7 +512,7 @@ async def run_grid_trading(_exchange_type: str = "standx", grid_config: dict = N
                         trading_state.active_grid_signle_price = max(
                             min_step, min(raw_step, max_step)
                         )
-                        logger.info(
+                        log_info(
                             "触发ATR动态放大: atr=%.4f > threshold=%.4f, "
                             "base_step=%.4f -> active_step=%.4f (raw_step=%.4f)",
                             atr_value,
@@ -444,7 +531,7 @@ async def run_grid_trading(_exchange_type: str = "standx", grid_config: dict = N
                             trading_state.active_grid_signle_price = (
                                 trading_state.base_grid_single_price * 2
                             )
-                            logger.info(
+                            log_info(
                                 "触发开仓侧警戒放大: base_step=%.4f -> active_step=%.4f, "
                                 "position=%.4f, alert_threshold=%.4f",
                                 trading_state.base_grid_single_price,
@@ -456,28 +543,43 @@ async def run_grid_trading(_exchange_type: str = "standx", grid_config: dict = N
                 # 定期风控检查 (每60秒)
                 if counter % 6 == 0:
                     if trading_state.current_price and "details" in locals():
-                        logger.info("波动检测: %s", details | {"result": is_rapid})
+                        log_info("波动检测: %s", details | {"result": is_rapid})
                     await _risk_check()
 
                 # 补单与成交兜底对账
-                # 注意：各函数内部已管理自己的锁，外层不要再套同一把锁，避免死锁
-                if time.time() - trading_state.last_replenish_time > 5:
-                    await check_current_orders()
+                # 注意：成交触发的补单由 replenish_worker 串行处理，这里只做定期兜底；
+                # 撤单与兜底补单都持有 replenish_grid_lock，避免与成交补单基于同一份订单簿重复下单
+                if time_time() - trading_state.last_replenish_time > 5:
+                    async with replenish_grid_lock:
+                        await check_current_orders()
                     await reconcile_fills_from_recent_trades(limit=50)
-                    await replenish_grid(False)
+                    # 先等已入队的成交补单全部完成，再做兜底补单
+                    await replenish_queue.join()
+                    async with replenish_grid_lock:
+                        await replenish_grid(False)
 
                 counter += 1
             except Exception:
                 logger.exception("执行循环检查时出现异常")
 
-    except KeyboardInterrupt:
-        logger.info("👋 收到停止信号")
+    except asyncio.CancelledError:
+        logger.info(_MSG_STOP_SIGNAL)
+    except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
+        logger.exception("网格交易运行时发生网络错误")
     except Exception:
-        logger.exception(f"网格交易运行时发生错误")
+        # 非网络类异常多为程序错误，记录后继续抛出，避免被静默吞掉
+        logger.exception("网格交易运行时发生错误")
+        raise
     finally:
         trading_state.is_running = False
-        await exchange.close()
-        logger.info("🔚 网格交易系统已停止")
+        if replenish_task is not None:
+            replenish_task.cancel()
+            # 等待补单任务真正退出，避免会话关闭时仍有下单请求在途
+            await asyncio.gather(replenish_task, return_exceptions=True)
+        try:
+            await exchange.close()
+        finally:
+            logger.info(_MSG_SYSTEM_STOPPED)
 
 
 if __name__ == "__main__":
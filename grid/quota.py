@@ -2,22 +2,55 @@ import pandas as pd
 import numpy as np
 
 
+def _prev_values(values: np.ndarray) -> np.ndarray:
+    """返回前移一位的数组（等价于 shift(1)），首位为 NaN"""
+    prev = np.empty_like(values)
+    prev[:1] = np.nan
+    prev[1:] = values[:-1]
+    return prev
+
+
+def _true_range(df: pd.DataFrame) -> np.ndarray:
+    """计算 True Range，前收盘价只构造一次供 hc/lc 共用"""
+    high = df["high"].to_numpy(dtype=float)
+    low = df["low"].to_numpy(dtype=float)
+    prev_close = _prev_values(df["close"].to_numpy(dtype=float))
+    # fmax 跳过 NaN，与 DataFrame.max(axis=1) 一致（首根K线只有 high-low）
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+def _rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    基于累加和的滚动求和，前 window-1 位为 NaN。
+    与 rolling(window).sum() 一致：窗口内含 NaN 时结果为 NaN。
+    """
+    out = np.full(len(values), np.nan)
+    if window < 1 or len(values) < window:
+        return out
+    nan_mask = np.isnan(values)
+    csum = np.concatenate(([0.0], np.cumsum(np.where(nan_mask, 0.0, values))))
+    ncount = np.concatenate(([0], np.cumsum(nan_mask)))
+    sums = csum[window:] - csum[:-window]
+    sums[(ncount[window:] - ncount[:-window]) > 0] = np.nan
+    out[window - 1:] = sums
+    return out
+
+
 def compute_atr(df: pd.DataFrame, period=14):
     """计算ATR"""
-    high_low = df["high"] - df["low"]
-    high_close = np.abs(df["high"] - df["close"].shift())
-    low_close = np.abs(df["low"] - df["close"].shift())
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    atr = tr.rolling(window=period).mean()
-    return atr
+    atr = _rolling_sum(_true_range(df), period) / period
+    return pd.Series(atr, index=df.index)
 
 
 def compute_vwap(df: pd.DataFrame, period=20):
     """计算滚动VWAP，适合5分钟K线"""
-    pv = (df["close"] * df["volume"]).rolling(window=period).sum()
-    v = df["volume"].rolling(window=period).sum()
-    vwap = pv / v
-    return vwap
+    close = df["close"].to_numpy(dtype=float)
+    volume = df["volume"].to_numpy(dtype=float)
+    pv = _rolling_sum(close * volume, period)
+    v = _rolling_sum(volume, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vwap = pv / v
+    return pd.Series(vwap, index=df.index)
 
 
 def compute_ema(df: pd.DataFrame, period=20, column="close"):
@@ -30,9 +63,10 @@ def compute_ema(df: pd.DataFrame, period=20, column="close"):
 
 def compute_rsi(df: pd.DataFrame, period=14):
     """计算RSI"""
-    delta = df["close"].diff()
-    gain = delta.where(delta > 0, 0)
-    loss = -delta.where(delta < 0, 0)
+    delta = df["close"].diff().to_numpy(dtype=float)
+    # 首个 delta 为 NaN，比较结果为 False，与原 where(..., 0) 一样记为 0
+    gain = pd.Series(np.where(delta > 0, delta, 0.0), index=df.index)
+    loss = pd.Series(np.where(delta < 0, -delta, 0.0), index=df.index)
     avg_gain = gain.rolling(window=period).mean()
     avg_loss = loss.rolling(window=period).mean()
     rs = avg_gain / avg_loss
@@ -42,27 +76,22 @@ def compute_rsi(df: pd.DataFrame, period=14):
 
 def compute_adx(df: pd.DataFrame, period=14):
     """计算ADX (Average Directional Index, 平均趋向指标)，用于衡量趋势的强度。周期14。"""
-    high = df["high"]
-    low = df["low"]
-    close = df["close"]
+    high = df["high"].to_numpy(dtype=float)
+    low = df["low"].to_numpy(dtype=float)
 
     # True Range
-    tr1 = high - low
-    tr2 = (high - close.shift()).abs()
-    tr3 = (low - close.shift()).abs()
-    tr = pd.DataFrame({"tr1": tr1, "tr2": tr2, "tr3": tr3}).max(axis=1)
+    tr = pd.Series(_true_range(df), index=df.index)
 
-    # Directional Movement
-    up_move = high.diff()
-    down_move = low.shift() - low
+    # Directional Movement（首位 NaN 比较为 False，记为 0）
+    up_move = high - _prev_values(high)
+    down_move = _prev_values(low) - low
 
-    plus_dm = pd.Series(0.0, index=df.index)
-    mask_plus = (up_move > down_move) & (up_move > 0)
-    plus_dm.loc[mask_plus] = up_move[mask_plus]
-
-    minus_dm = pd.Series(0.0, index=df.index)
-    mask_minus = (down_move > up_move) & (down_move > 0)
-    minus_dm.loc[mask_minus] = down_move[mask_minus]
+    plus_dm = pd.Series(
+        np.where((up_move > down_move) & (up_move > 0), up_move, 0.0), index=df.index
+    )
+    minus_dm = pd.Series(
+        np.where((down_move > up_move) & (down_move > 0), down_move, 0.0), index=df.index
+    )
 
     # Wilder's smoothing using ewm (alpha = 1/period)
     alpha = 1 / period
@@ -77,19 +106,21 @@ def compute_adx(df: pd.DataFrame, period=14):
 
 def compute_linear_regression_slope(df: pd.DataFrame, period=14):
     """计算Linear Regression Slope (线性回归斜率)，用于计算价格下跌的角度。周期14。"""
+    close = df["close"]
+    if period < 2:
+        return pd.Series(0.0, index=df.index, name=close.name).where(close.notna())
 
-    def calc_slope(prices):
-        if len(prices) < 2:
-            return 0.0
-        x = np.arange(len(prices))
-        cov_xy = np.cov(x, prices)[0, 1]
-        var_x = np.var(x)
-        if var_x == 0:
-            return 0.0
-        return cov_xy / var_x
+    # x 固定为 0..period-1，用去中心化的 x 做一次卷积即得每个窗口的 Sxy
+    x_centered = np.arange(period) - (period - 1) / 2
+    sxx = float((x_centered ** 2).sum())
+    # 与原实现一致：np.cov(ddof=1) / np.var(ddof=0)
+    scale = period / ((period - 1) * sxx)
 
-    slope = df["close"].rolling(window=period).apply(calc_slope, raw=True)
-    return slope
+    y = close.to_numpy(dtype=float)
+    slope = np.full(len(y), np.nan)
+    if len(y) >= period:
+        slope[period - 1:] = np.convolve(y, x_centered[::-1], mode="valid") * scale
+    return pd.Series(slope, index=df.index, name=close.name)
 
 
 def compute_roc(df: pd.DataFrame, period=14):
@@ -110,9 +141,11 @@ def compute_bollinger_pb(df: pd.DataFrame, period=20, std_dev=2.0):
 
 def compute_volume_ratio(df, period=20):
     """Volume Ratio (量比)：当前Volume / 过去20根K线Volume均值"""
-    vol_avg = df["volume"].rolling(window=period).mean().shift(1)
-    vr = df["volume"] / vol_avg
-    return vr
+    volume = df["volume"].to_numpy(dtype=float)
+    vol_avg = _prev_values(_rolling_sum(volume, period) / period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vr = volume / vol_avg
+    return pd.Series(vr, index=df.index, name=df["volume"].name)
 
 
 def compute_atr_multiplier(df, atr_period=14, period=20):